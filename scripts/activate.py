@@ -13,10 +13,13 @@ import sys
 from pathlib import Path
 from typing import List
 
-from render_schedule import cron_lines, write_launchd_plist
+from memory_lib import dumps_json
+from render_schedule import cron_lines, launchd_payloads, write_launchd_plist
 
 CRON_BEGIN = "# >>> OPENCLAW_MEMORY_GOVERNANCE_BEGIN >>>"
 CRON_END = "# <<< OPENCLAW_MEMORY_GOVERNANCE_END <<<"
+_SYSTEM = platform.system().lower()
+CRON_BLOCK_RE = re.compile(rf"{re.escape(CRON_BEGIN)}[\s\S]*?{re.escape(CRON_END)}\n?", re.MULTILINE)
 
 
 def _run(cmd: List[str], *, check: bool = True, input_text: str | None = None) -> subprocess.CompletedProcess:
@@ -117,13 +120,20 @@ def _install_cron(lines: List[str], dry_run: bool) -> dict:
             raise RuntimeError(f"unable to read existing crontab: {existing_proc.stderr.strip()}")
 
     block = "\n".join([CRON_BEGIN, *lines, CRON_END]) + "\n"
-    pattern = re.compile(rf"{re.escape(CRON_BEGIN)}[\s\S]*?{re.escape(CRON_END)}\n?", re.MULTILINE)
-    without_old = re.sub(pattern, "", existing).rstrip()
+    without_old = CRON_BLOCK_RE.sub("", existing).rstrip()
     if without_old:
         new_crontab = without_old + "\n\n" + block
     else:
         new_crontab = block
 
+    if new_crontab == existing:
+        return {
+            "installed": False,
+            "reason": "unchanged",
+            "line_count": len(lines),
+            "managed_block": True,
+        }
+
     if not dry_run:
         _run(["crontab", "-"], check=True, input_text=new_crontab)
 
@@ -144,89 +154,14 @@ def _generate_launchd(
     logs_dir.mkdir(parents=True, exist_ok=True)
     launchd_dir.mkdir(parents=True, exist_ok=True)
 
-    write_launchd_plist(
-        launchd_dir / "com.openclaw.memory.bootstrap.plist",
-        "com.openclaw.memory.bootstrap",
-        scripts_dir / "bootstrap_profile_once.py",
-        workspace,
-        logs_dir,
-        hour=2,
-        minute=55,
-        run_at_load=True,
-    )
-    write_launchd_plist(
-        launchd_dir / "com.openclaw.memory.importance.plist",
-        "com.openclaw.memory.importance",
-        scripts_dir / "importance_score.py",
-        workspace,
-        logs_dir,
-        hour=0,
-        minute=5,
-        extra_args=["--window-days", "30", "--max-updates", "400"],
-    )
-    write_launchd_plist(
-        launchd_dir / "com.openclaw.memory.hourly.plist",
-        "com.openclaw.memory.hourly",
-        scripts_dir / "hourly_semantic_extract.py",
-        workspace,
-        logs_dir,
-        hour=0,
-        minute=0,
-    )
-    write_launchd_plist(
-        launchd_dir / "com.openclaw.memory.daily.plist",
-        "com.openclaw.memory.daily",
-        scripts_dir / "daily_consolidate.py",
-        workspace,
-        logs_dir,
-        hour=3,
-        minute=10,
-        extra_args=[
-            "--agent-id",
-            agent_id,
-            "--transcript-root",
-            "archive/transcripts",
-            "--transcript-mode",
-            "sanitized",
-        ],
-    )
-    write_launchd_plist(
-        launchd_dir / "com.openclaw.memory.weekly-identity.plist",
-        "com.openclaw.memory.weekly-identity",
-        scripts_dir / "weekly_identity_promote.py",
-        workspace,
-        logs_dir,
-        hour=4,
-        minute=10,
-        weekday=0,
-        extra_args=["--window-days", "30", "--min-importance", "0.85", "--min-recurrence", "3"],
-    )
-    write_launchd_plist(
-        launchd_dir / "com.openclaw.memory.weekly.plist",
-        "com.openclaw.memory.weekly",
-        scripts_dir / "weekly_drift_review.py",
-        workspace,
-        logs_dir,
-        hour=4,
-        minute=20,
-        weekday=0,
-    )
-    write_launchd_plist(
-        launchd_dir / "com.openclaw.memory.session-hygiene.plist",
-        "com.openclaw.memory.session-hygiene",
-        scripts_dir / "session_hygiene.py",
-        workspace,
-        logs_dir,
-        hour=3,
-        minute=40,
-        extra_args=["--agent-id", agent_id, "--retention-days", "30", "--skip-recent-minutes", "30"],
-    )
+    for filename, payload in launchd_payloads(workspace, scripts_dir, agent_id):
+        write_launchd_plist(launchd_dir / filename, payload)
 
     return sorted(launchd_dir.glob("com.openclaw.memory*.plist"))
 
 
 def _install_launchd(plist_paths: list[Path], dry_run: bool) -> dict:
-    if platform.system().lower() != "darwin":
+    if _SYSTEM != "darwin":
         raise RuntimeError("launchd installation is only supported on macOS.")
 
     domain = f"gui/{os.getuid()}"
@@ -246,7 +181,7 @@ def _install_launchd(plist_paths: list[Path], dry_run: bool) -> dict:
 def _resolve_scheduler(mode: str) -> str:
     if mode != "auto":
         return mode
-    if platform.system().lower() == "darwin":
+    if _SYSTEM == "darwin":
         return "launchd"
     return "cron"
 
@@ -336,7 +271,7 @@ def main() -> int:
         "doctor": doctor_result,
         "dry_run": bool(args.dry_run),
     }
-    print(json.dumps(payload, indent=2))
+    print(dumps_json(payload))
     if overall_status == "fail":
         return 1
     return 0
@@ -5,23 +5,27 @@ from __future__ import annotations
 
 import argparse
 import datetime as dt
-import json
 from pathlib import Path
 
-from memory_lib import atomic_write_text, ensure_workspace_layout, is_under_root
+from memory_lib import atomic_write_text, dumps_json, ensure_workspace_layout, is_under_root
 from select_memory_profile import detect_qmd, load_json, resolve_profile_paths, write_json
 
 
 def deep_merge(base, overlay):
-    if isinstance(base, dict) and isinstance(overlay, dict):
-        out = dict(base)
-        for key, value in overlay.items():
-            if key in out:
-                out[key] = deep_merge(out[key], value)
+    if not (isinstance(base, dict) and isinstance(overlay, dict)):
+        return overlay
+    result = dict(base)
+    stack = [(result, overlay)]
+    while stack:
+        dst, src = stack.pop()
+        for key, value in src.items():
+            current = dst.get(key)
+            if isinstance(current, dict) and isinstance(value, dict):
+                dst[key] = dict(current)
+                stack.append((dst[key], value))
             else:
-                out[key] = value
-        return out
-    return overlay
+                dst[key] = value
+    return result
 
 
 def now_z() -> str:
@@ -47,10 +51,6 @@ def main() -> int:
 
     workspace = Path(args.workspace).expanduser().resolve()
     ensure_workspace_layout(workspace)
-    skill_root = Path(__file__).resolve().parents[1]
-    profiles_dir = Path(args.profiles_dir).expanduser().resolve() if args.profiles_dir else (skill_root / "references" / "profiles").resolve()
-    builtin_profile, qmd_profile = resolve_profile_paths(profiles_dir)
-
     state_path = (workspace / args.state_file).resolve()
     if not is_under_root(state_path, workspace):
         raise SystemExit("Refusing state-file outside workspace.")
@@ -60,9 +60,13 @@ def main() -> int:
             "reason": "already_bootstrapped",
             "state_file": str(state_path),
         }
-        print(json.dumps(payload, indent=2))
+        print(dumps_json(payload))
         return 0
 
+    skill_root = Path(__file__).resolve().parents[1]
+    profiles_dir = Path(args.profiles_dir).expanduser().resolve() if args.profiles_dir else (skill_root / "references" / "profiles").resolve()
+    builtin_profile, qmd_profile = resolve_profile_paths(profiles_dir)
+
     qmd_detected, qmd_reason = detect_qmd(args.qmd_command, args.qmd_timeout_seconds)
     selected_backend = "qmd" if qmd_detected else "builtin"
     selected_profile_path = qmd_profile if selected_backend == "qmd" else builtin_profile
@@ -92,9 +96,9 @@ def main() -> int:
         "target_config": str(target_config),
     }
     if not args.dry_run:
-        atomic_write_text(state_path, json.dumps(state_payload, indent=2) + "\n", encoding="utf-8")
+        atomic_write_text(state_path, dumps_json(state_payload) + "\n", encoding="utf-8", fsync=True)
 
-    print(json.dumps({"status": "applied", **state_payload, "dry_run": bool(args.dry_run)}, indent=2))
+    print(dumps_json({"status": "applied", **state_payload, "dry_run": bool(args.dry_run)}))
     return 0
 
 
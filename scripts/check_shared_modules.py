@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""Fail when the root and shipped-skill copies of shared modules drift apart."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SKILL_SCRIPTS = REPO_ROOT / "skills" / "openclaw-memory-governance" / "scripts"
+
+# Both script trees are bundled standalone, so each keeps its own physical copy.
+SHARED_MODULES = (
+    "activate.py",
+    "memory_lib.py",
+    "render_schedule.py",
+    "select_memory_profile.py",
+    "smoke_suite.py",
+)
+
+
+def main() -> int:
+    failures: list[str] = []
+    for name in SHARED_MODULES:
+        root_copy = REPO_ROOT / "scripts" / name
+        skill_copy = SKILL_SCRIPTS / name
+        if not root_copy.exists() or not skill_copy.exists():
+            failures.append(f"{name}: missing from scripts/ or the skill scripts directory")
+            continue
+        if root_copy.read_bytes() != skill_copy.read_bytes():
+            failures.append(f"{name}: scripts/ copy differs from the skill copy")
+
+    if failures:
+        print("shared_module_check failed")
+        for item in failures:
+            print(item)
+        return 1
+
+    print("shared_module_check ok")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
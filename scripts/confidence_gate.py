@@ -7,6 +7,11 @@ import argparse
 import json
 from typing import Dict, List
 
+_TRUE = frozenset({"true", "1", "yes", "y"})
+_FALSE = frozenset({"false", "0", "no", "n"})
+# An idle or stalled client is dropped after this long so it cannot block the accept loop.
+SERVE_CONNECTION_TIMEOUT_SECONDS = 5.0
+
 
 def clamp(value: float, low: float = 0.0, high: float = 1.0) -> float:
     return max(low, min(high, value))
@@ -14,9 +19,9 @@ def clamp(value: float, low: float = 0.0, high: float = 1.0) -> float:
 
 def parse_bool(value: str) -> bool:
     normalized = value.strip().lower()
-    if normalized in {"true", "1", "yes", "y"}:
+    if normalized in _TRUE:
         return True
-    if normalized in {"false", "0", "no", "n"}:
+    if normalized in _FALSE:
         return False
     raise argparse.ArgumentTypeError("Expected true|false")
 
@@ -61,17 +66,108 @@ def evaluate_confidence_gate(
     }
 
 
+def evaluate_request(request: Dict[str, object]) -> Dict[str, object]:
+    continuation = request["continuation_intent"]
+    if not isinstance(continuation, bool):
+        continuation = parse_bool(str(continuation))
+    return evaluate_confidence_gate(
+        avg_similarity=float(request["avg_similarity"]),
+        result_count=int(request["result_count"]),
+        retrieval_confidence=float(request.get("retrieval_confidence", -1.0)),
+        continuation_intent=continuation,
+        min_similarity=float(request.get("min_similarity", 0.72)),
+        min_results=int(request.get("min_results", 5)),
+        min_confidence=float(request.get("min_confidence", 0.65)),
+    )
+
+
+def serve(socket_arg: str) -> int:
+    import os
+    import signal
+    import socket
+    import stat
+    import sys
+    from pathlib import Path
+
+    socket_path = Path(socket_arg).expanduser()
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    if socket_path.exists() or socket_path.is_symlink():
+        if not stat.S_ISSOCK(socket_path.lstat().st_mode):
+            raise SystemExit(f"Refusing to replace non-socket path: {socket_path}")
+        socket_path.unlink()
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        server.bind(str(socket_path))
+        os.chmod(socket_path, 0o600)
+        server.listen()
+        while True:
+            conn, _ = server.accept()
+            conn.settimeout(SERVE_CONNECTION_TIMEOUT_SECONDS)
+            # Timeouts and clients that vanish mid-reply only end their own connection.
+            try:
+                with conn, conn.makefile("rwb") as stream:
+                    for raw in stream:
+                        raw = raw.strip()
+                        if not raw:
+                            continue
+                        try:
+                            request = json.loads(raw)
+                            if not isinstance(request, dict):
+                                raise ValueError("request must be a JSON object")
+                            response = evaluate_request(request)
+                        except (
+                            KeyError,
+                            TypeError,
+                            ValueError,
+                            OverflowError,
+                            RecursionError,
+                            argparse.ArgumentTypeError,
+                        ) as exc:
+                            response = {"error": f"{exc.__class__.__name__}: {exc}"}
+                        stream.write(json.dumps(response).encode("utf-8") + b"\n")
+                        stream.flush()
+            except OSError:
+                continue
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        server.close()
+        try:
+            socket_path.unlink()
+        except OSError:
+            pass
+
+
 def main() -> int:
     parser = argparse.ArgumentParser()
-    parser.add_argument("--avg-similarity", type=float, required=True)
-    parser.add_argument("--result-count", type=int, required=True)
+    parser.add_argument("--avg-similarity", type=float)
+    parser.add_argument("--result-count", type=int)
     parser.add_argument("--retrieval-confidence", type=float, default=-1.0)
-    parser.add_argument("--continuation-intent", type=parse_bool, required=True)
+    parser.add_argument("--continuation-intent", type=parse_bool)
     parser.add_argument("--min-similarity", type=float, default=0.72)
     parser.add_argument("--min-results", type=int, default=5)
     parser.add_argument("--min-confidence", type=float, default=0.65)
+    parser.add_argument(
+        "--serve",
+        default="",
+        help="Serve newline-delimited JSON requests on this Unix socket path instead of evaluating once.",
+    )
     args = parser.parse_args()
 
+    if args.serve:
+        return serve(args.serve)
+    missing = [
+        flag
+        for flag, value in [
+            ("--avg-similarity", args.avg_similarity),
+            ("--result-count", args.result_count),
+            ("--continuation-intent", args.continuation_intent),
+        ]
+        if value is None
+    ]
+    if missing:
+        parser.error(f"the following arguments are required: {', '.join(missing)}")
+
     payload = evaluate_confidence_gate(
         avg_similarity=args.avg_similarity,
         result_count=args.result_count,
@@ -5,10 +5,12 @@ from __future__ import annotations
 
 import argparse
 import datetime as dt
+import io
 import json
 import os
 import shutil
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, Iterable, List, Tuple
 
@@ -20,6 +22,7 @@ from memory_lib import (
     ensure_workspace_layout,
     file_lock,
     is_under_root,
+    markdown_entries,
     normalize_text,
     parse_date_from_filename,
     parse_memory_file,
@@ -30,104 +33,140 @@ from memory_lib import (
 )
 
 
+# Session event keys in priority order.
+_TS_KEYS = ("timestamp", "time", "createdAt", "created_at", "ts")
+_ROLE_KEYS = ("role", "speaker", "author")
+_TEXT_KEYS = ("text", "message", "output")
+_EVENT_KEYSET = frozenset(_TS_KEYS + _ROLE_KEYS + ("content",) + _TEXT_KEYS)
+
+
 def _status_rank(status: str) -> int:
     order = {"active": 3, "refined": 2, "historical": 1}
     return order.get(status, 0)
 
 
-def consolidate_semantic(workspace: Path, dry_run: bool) -> int:
-    semantic_dir = workspace / "memory" / "semantic"
-    semantic_dir.mkdir(parents=True, exist_ok=True)
+def _worker_count() -> int:
+    return min(8, os.cpu_count() or 4)
+
+
+def _consolidate_semantic_file(path: Path, dry_run: bool) -> int:
+    preamble, entries = parse_memory_file(path)
+    if not entries:
+        return 0
+    groups: Dict[str, List[Tuple[float, int, MemoryEntry]]] = defaultdict(list)
+    for entry in entries:
+        key = normalize_text(entry.body)
+        importance = entry.get_float("importance", 0.0)
+        rank = _status_rank(entry.meta.get("status", ""))
+        groups[key].append((importance, rank, entry))
     deduped = 0
-    for path in sorted(semantic_dir.glob("*.md")):
-        preamble, entries = parse_memory_file(path)
-        if not entries:
-            continue
-        best_by_key: Dict[str, MemoryEntry] = {}
-        for entry in entries:
-            key = normalize_text(entry.body)
-            existing = best_by_key.get(key)
-            if existing is None:
-                best_by_key[key] = entry
+    changed = False
+    merged: List[MemoryEntry] = []
+    for candidates in groups.values():
+        # max() keeps the earliest entry on ties, matching file order.
+        winner = max(candidates, key=lambda c: (c[0], c[1]))[2]
+        for _, _, loser in candidates:
+            if loser is winner:
                 continue
-            winner = existing
-            loser = entry
-            if entry.get_float("importance", 0.0) > existing.get_float("importance", 0.0):
-                winner, loser = entry, existing
-            elif entry.get_float("importance", 0.0) == existing.get_float("importance", 0.0):
-                if _status_rank(entry.meta.get("status", "")) > _status_rank(existing.meta.get("status", "")):
-                    winner, loser = entry, existing
-            if winner is entry:
-                best_by_key[key] = entry
-            deduped += 1
             if winner.meta.get("supersedes", "none") == "none" and loser.meta.get("supersedes", "none") != "none":
-                winner.meta["supersedes"] = loser.meta.get("supersedes", "none")
-        merged = list(best_by_key.values())
-        if not dry_run:
-            write_memory_file(path, preamble, merged)
+                winner.meta["supersedes"] = loser.meta["supersedes"]
+                changed = True
+        if len(candidates) > 1:
+            deduped += len(candidates) - 1
+            changed = True
+        merged.append(winner)
+    if changed and not dry_run:
+        write_memory_file(path, preamble, merged)
     return deduped
 
 
+def consolidate_semantic(workspace: Path, dry_run: bool) -> int:
+    semantic_dir = workspace / "memory" / "semantic"
+    semantic_dir.mkdir(parents=True, exist_ok=True)
+    paths = sorted(semantic_dir.glob("*.md"))
+    if len(paths) <= 1:
+        return sum(_consolidate_semantic_file(path, dry_run) for path in paths)
+    # Files are independent, so overlap parse/write I/O across a small pool.
+    with ThreadPoolExecutor(max_workers=_worker_count()) as pool:
+        return sum(pool.map(lambda path: _consolidate_semantic_file(path, dry_run), paths))
+
+
+def _unlink_missing_ok(path: str) -> None:
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
 def prune_episodic(workspace: Path, retention_days: int, dry_run: bool) -> int:
     episodic_dir = workspace / "memory" / "episodic"
     episodic_dir.mkdir(parents=True, exist_ok=True)
     cutoff = dt.date.today() - dt.timedelta(days=retention_days)
     removed = 0
-    for path in sorted(episodic_dir.glob("*.md")):
-        file_date = parse_date_from_filename(path.name)
+    for item in markdown_entries(episodic_dir):
+        file_date = parse_date_from_filename(item.name)
         if file_date and file_date < cutoff:
             removed += 1
             if not dry_run:
-                path.unlink(missing_ok=True)
+                _unlink_missing_ok(item.path)
     return removed
 
 
-def _extract_timestamp(obj: Dict, fallback: dt.datetime) -> dt.datetime:
-    for key in ["timestamp", "time", "createdAt", "created_at", "ts"]:
-        value = obj.get(key)
+def _extract_event(obj: Dict, fallback: dt.datetime) -> Tuple[dt.datetime, str, str]:
+    present = _EVENT_KEYSET.intersection(obj)
+    utc = dt.timezone.utc
+
+    ts = fallback
+    for key in _TS_KEYS:
+        if key not in present:
+            continue
+        value = obj[key]
         if value is None:
             continue
         if isinstance(value, (int, float)):
             try:
-                return dt.datetime.fromtimestamp(value, tz=dt.timezone.utc)
-            except (OSError, ValueError):
+                ts = dt.datetime.fromtimestamp(value, tz=utc)
+                break
+            except (OSError, OverflowError, ValueError):
                 continue
-        parsed = parse_iso_date(str(value))
+        raw = str(value)
+        try:
+            parsed = dt.datetime.fromisoformat(raw[:-1] + "+00:00" if raw.endswith("Z") else raw)
+        except ValueError:
+            parsed = parse_iso_date(raw)
         if parsed is not None:
-            if parsed.tzinfo is None:
-                return parsed.replace(tzinfo=dt.timezone.utc)
-            return parsed.astimezone(dt.timezone.utc)
-    return fallback
+            ts = parsed.replace(tzinfo=utc) if parsed.tzinfo is None else parsed.astimezone(utc)
+            break
 
-
-def _extract_role(obj: Dict) -> str:
-    for key in ["role", "speaker", "author"]:
-        value = obj.get(key)
+    role = "unknown"
+    for key in _ROLE_KEYS:
+        value = obj[key] if key in present else None
         if isinstance(value, str) and value.strip():
-            return value.strip().lower()
-    return "unknown"
-
+            role = value.strip().lower()
+            break
 
-def _extract_text(obj: Dict) -> str:
-    value = obj.get("content")
+    text = ""
+    value = obj["content"] if "content" in present else None
     if isinstance(value, str) and value.strip():
-        return value.strip()
-    for key in ["text", "message", "output"]:
-        value = obj.get(key)
-        if isinstance(value, str) and value.strip():
-            return value.strip()
-    if isinstance(value, list):
-        chunks: List[str] = []
-        for item in value:
-            if isinstance(item, dict):
-                txt = item.get("text")
-                if isinstance(txt, str) and txt.strip():
-                    chunks.append(txt.strip())
-            elif isinstance(item, str):
-                chunks.append(item.strip())
-        if chunks:
-            return " ".join(chunks)
-    return ""
+        text = value.strip()
+    else:
+        for key in _TEXT_KEYS:
+            value = obj[key] if key in present else None
+            if isinstance(value, str) and value.strip():
+                text = value.strip()
+                break
+        else:
+            if isinstance(value, list):
+                chunks: List[str] = []
+                for item in value:
+                    if isinstance(item, dict):
+                        txt = item.get("text")
+                        if isinstance(txt, str) and txt.strip():
+                            chunks.append(txt.strip())
+                    elif isinstance(item, str):
+                        chunks.append(item.strip())
+                text = " ".join(chunks)
+    return ts, role, text
 
 
 def _iter_session_events(
@@ -157,11 +196,11 @@ def _iter_session_events(
                     obj = json.loads(raw)
                 except json.JSONDecodeError:
                     continue
-                ts = _extract_timestamp(obj, fallback=fallback_ts)
+                if not isinstance(obj, dict):
+                    continue
+                ts, role, text = _extract_event(obj, fallback=fallback_ts)
                 if ts.date() < since_date:
                     continue
-                role = _extract_role(obj)
-                text = _extract_text(obj)
                 if not text:
                     continue
                 text = " ".join(text.split())
@@ -172,6 +211,10 @@ def _iter_session_events(
                 yield (ts, role, text, jsonl.name)
 
 
+def _write_transcript_day(path: Path, text: str) -> None:
+    atomic_write_text(path, text, encoding="utf-8", mode=0o600)
+
+
 def build_transcript_mirror(
     workspace: Path,
     sessions_dir: Path | None,
@@ -186,10 +229,10 @@ def build_transcript_mirror(
     if transcript_mode == "off":
         removed = 0
         if transcript_dir.exists():
-            for path in sorted(transcript_dir.glob("*.md")):
+            for item in markdown_entries(transcript_dir):
                 removed += 1
                 if not dry_run:
-                    path.unlink(missing_ok=True)
+                    _unlink_missing_ok(item.path)
         return 0, removed
 
     transcript_dir.mkdir(parents=True, exist_ok=True)
@@ -202,29 +245,32 @@ def build_transcript_mirror(
         by_day: Dict[dt.date, List[Tuple[dt.datetime, str, str, str]]] = defaultdict(list)
         for item in _iter_session_events(sessions_dir, since_date=since, transcript_mode=transcript_mode):
             by_day[item[0].date()].append(item)
+        pending: List[Tuple[Path, str]] = []
         for day, events in sorted(by_day.items()):
             events.sort(key=lambda x: x[0])
-            out = [f"# {day.isoformat()}", ""]
+            buf = io.StringIO()
+            w = buf.write
+            w(f"# {day.isoformat()}\n\n")
             for ts, role, text, source in events:
-                out.append(f"## {ts.strftime('%H:%M:%S')} - {role} ({source})")
-                out.append(text)
-                out.append("")
+                w(f"## {ts.strftime('%H:%M:%S')} - {role} ({source})\n{text}\n\n")
             path = transcript_dir / f"{day.isoformat()}.md"
             written += 1
             if not dry_run:
-                atomic_write_text(path, "\n".join(out).rstrip() + "\n", encoding="utf-8")
-                try:
-                    os.chmod(path, 0o600)
-                except OSError:
-                    pass
+                pending.append((path, buf.getvalue().rstrip() + "\n"))
+        if len(pending) > 1:
+            with ThreadPoolExecutor(max_workers=_worker_count()) as pool:
+                list(pool.map(lambda item: _write_transcript_day(*item), pending))
+        else:
+            for path, text in pending:
+                _write_transcript_day(path, text)
 
     removed = 0
-    for path in sorted(transcript_dir.glob("*.md")):
-        file_date = parse_date_from_filename(path.name)
+    for item in markdown_entries(transcript_dir):
+        file_date = parse_date_from_filename(item.name)
         if file_date and file_date < since:
             removed += 1
             if not dry_run:
-                path.unlink(missing_ok=True)
+                _unlink_missing_ok(item.path)
     return written, removed
 
 
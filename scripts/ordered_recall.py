@@ -6,11 +6,10 @@ from __future__ import annotations
 import argparse
 import datetime as dt
 import json
-import re
 from pathlib import Path
 from typing import Dict, List
 
-from memory_lib import ensure_workspace_layout, parse_date_from_filename, parse_iso_date, parse_memory_file
+from memory_lib import TOKEN_RE, ensure_workspace_layout, parse_date_from_filename, parse_iso_date, parse_memory_file
 
 IDENTITY_FILES = [
     "memory/identity/identity.md",
@@ -20,7 +19,7 @@ IDENTITY_FILES = [
 
 
 def _tokenize(value: str) -> set[str]:
-    return set(re.findall(r"[a-z0-9_]+", value.lower()))
+    return set(TOKEN_RE.findall(value.lower()))
 
 
 def _excerpt(value: str, max_chars: int) -> str:
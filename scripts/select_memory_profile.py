@@ -4,34 +4,98 @@
 from __future__ import annotations
 
 import argparse
-import datetime as dt
 import json
+import os
 import shutil
-import subprocess
+import time
 from pathlib import Path
 from typing import Any, Dict, Tuple
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+from memory_lib import atomic_write_text, default_file_mode, fast_resolve
+
+_SKILL_ROOT = Path(__file__).resolve().parents[1]
+QMD_CACHE_TTL_SECONDS = 3600
+_CLI_ARGS = (
+    (("--workspace",), {"default": ".", "help": "OpenClaw workspace root."}),
+    (
+        ("--profiles-dir",),
+        {
+            "default": "",
+            "help": "Directory containing openclaw.memory-profile*.json files. Defaults to skill references/profiles.",
+        },
+    ),
+    (
+        ("--repo-root",),
+        {
+            "default": "",
+            "help": "Deprecated fallback for older layouts. If set, profiles are loaded from this path.",
+        },
+    ),
+    (
+        ("--output",),
+        {
+            "default": "openclaw.memory-profile.selected.json",
+            "help": "Workspace-relative output path for selected profile snapshot.",
+        },
+    ),
+    (
+        ("--target-config",),
+        {
+            "default": "",
+            "help": "Optional OpenClaw config file to merge selected profile into (e.g. ~/.openclaw/openclaw.json).",
+        },
+    ),
+    (
+        ("--force-backend",),
+        {
+            "choices": ["auto", "builtin", "qmd"],
+            "default": "auto",
+            "help": "Force backend choice or auto-detect qmd availability.",
+        },
+    ),
+    (("--qmd-command",), {"default": "qmd", "help": "Command used for qmd detection."}),
+    (("--qmd-timeout-seconds",), {"type": int, "default": 4, "help": "qmd --version timeout."}),
+    (("--apply",), {"action": "store_true", "help": "Write selected profile output and optional target-config merge."}),
+    (("--dry-run",), {"action": "store_true"}),
+    (("--no-backup",), {"action": "store_true", "help": "Disable backup when writing target-config."}),
+)
+
 
 def load_json(path: Path) -> Dict[str, Any]:
-    return json.loads(path.read_text(encoding="utf-8"))
+    data = path.read_bytes()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
 
 def deep_merge(base: Any, overlay: Any) -> Any:
-    if isinstance(base, dict) and isinstance(overlay, dict):
-        out = dict(base)
-        for key, value in overlay.items():
-            if key in out:
-                out[key] = deep_merge(out[key], value)
+    if not (isinstance(base, dict) and isinstance(overlay, dict)):
+        return overlay
+    out = dict(base)
+    stack = [(out, overlay)]
+    while stack:
+        dst, src = stack.pop()
+        for key, value in src.items():
+            current = dst.get(key)
+            if isinstance(current, dict) and isinstance(value, dict):
+                dst[key] = dict(current)
+                stack.append((dst[key], value))
             else:
-                out[key] = value
-        return out
-    return overlay
+                dst[key] = value
+    return out
 
 
 def detect_qmd(command: str, timeout_seconds: int) -> Tuple[bool, str]:
     resolved = shutil.which(command)
     if not resolved:
         return False, "binary_not_found"
+    import subprocess
+
     try:
         proc = subprocess.run(
             [resolved, "--version"],
@@ -52,15 +116,62 @@ def detect_qmd(command: str, timeout_seconds: int) -> Tuple[bool, str]:
     return True, version[0].strip()
 
 
+def _qmd_cache_path(workspace: Path) -> Path:
+    return workspace / "memory" / "state" / "qmd-detect.json"
+
+
+def _cached_detect_qmd(workspace: Path, command: str, timeout_seconds: int, persist: bool) -> Tuple[bool, str]:
+    resolved = shutil.which(command)
+    if not resolved:
+        return False, "binary_not_found"
+    try:
+        mtime_ns = os.stat(resolved).st_mtime_ns
+    except OSError:
+        return detect_qmd(command, timeout_seconds)
+
+    cache_path = _qmd_cache_path(workspace)
+    now = time.time()
+    try:
+        cached = load_json(cache_path)
+        if (
+            cached.get("path") == resolved
+            and cached.get("mtime_ns") == mtime_ns
+            and 0 <= now - float(cached.get("checked_at", 0)) < QMD_CACHE_TTL_SECONDS
+        ):
+            return bool(cached["detected"]), str(cached["reason"])
+    except (OSError, ValueError, TypeError, KeyError, AttributeError):
+        pass
+
+    detected, reason = detect_qmd(command, timeout_seconds)
+    if not persist or not detected:
+        # Read-only runs (--dry-run, or no --apply) may use the cache but never create it.
+        # Failed probes (timeouts, errors, non-zero exits) are retried on the next run.
+        return detected, reason
+    record = {"path": resolved, "mtime_ns": mtime_ns, "checked_at": now, "detected": detected, "reason": reason}
+    try:
+        write_json(cache_path, record)
+    except OSError:
+        pass
+    return detected, reason
+
+
 def write_json(path: Path, payload: Dict[str, Any]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+    # Profile and OpenClaw config files are not private memory: new ones get the umask default.
+    # They are rewritten rarely, so each write is fsynced to survive a power loss.
+    atomic_write_text(
+        path,
+        json.dumps(payload, indent=2) + "\n",
+        encoding="utf-8",
+        fsync=True,
+        new_file_mode=default_file_mode(),
+    )
 
 
 def backup_file(path: Path) -> Path:
-    stamp = dt.datetime.now(dt.timezone.utc).strftime("%Y%m%d%H%M%S")
+    stamp = time.strftime("%Y%m%d%H%M%S", time.gmtime())
     backup = path.with_name(f"{path.name}.bak.{stamp}")
-    shutil.copy2(path, backup)
+    shutil.copyfile(path, backup)
+    shutil.copymode(path, backup)
     return backup
 
 
@@ -76,48 +187,17 @@ def resolve_profile_paths(profiles_dir: Path) -> Tuple[Path, Path]:
 
 def main() -> int:
     parser = argparse.ArgumentParser()
-    parser.add_argument("--workspace", default=".", help="OpenClaw workspace root.")
-    parser.add_argument(
-        "--profiles-dir",
-        default="",
-        help="Directory containing openclaw.memory-profile*.json files. Defaults to skill references/profiles.",
-    )
-    parser.add_argument(
-        "--repo-root",
-        default="",
-        help="Deprecated fallback for older layouts. If set, profiles are loaded from this path.",
-    )
-    parser.add_argument(
-        "--output",
-        default="openclaw.memory-profile.selected.json",
-        help="Workspace-relative output path for selected profile snapshot.",
-    )
-    parser.add_argument(
-        "--target-config",
-        default="",
-        help="Optional OpenClaw config file to merge selected profile into (e.g. ~/.openclaw/openclaw.json).",
-    )
-    parser.add_argument(
-        "--force-backend",
-        choices=["auto", "builtin", "qmd"],
-        default="auto",
-        help="Force backend choice or auto-detect qmd availability.",
-    )
-    parser.add_argument("--qmd-command", default="qmd", help="Command used for qmd detection.")
-    parser.add_argument("--qmd-timeout-seconds", type=int, default=4, help="qmd --version timeout.")
-    parser.add_argument("--apply", action="store_true", help="Write selected profile output and optional target-config merge.")
-    parser.add_argument("--dry-run", action="store_true")
-    parser.add_argument("--no-backup", action="store_true", help="Disable backup when writing target-config.")
+    for flags, kwargs in _CLI_ARGS:
+        parser.add_argument(*flags, **kwargs)
     args = parser.parse_args()
 
-    workspace = Path(args.workspace).expanduser().resolve()
-    skill_root = Path(__file__).resolve().parents[1]
+    workspace = fast_resolve(args.workspace)
     if args.profiles_dir:
-        profiles_dir = Path(args.profiles_dir).expanduser().resolve()
+        profiles_dir = fast_resolve(args.profiles_dir)
     elif args.repo_root:
-        profiles_dir = Path(args.repo_root).expanduser().resolve()
+        profiles_dir = fast_resolve(args.repo_root)
     else:
-        profiles_dir = (skill_root / "references" / "profiles").resolve()
+        profiles_dir = (_SKILL_ROOT / "references" / "profiles").resolve()
     builtin_profile, qmd_profile = resolve_profile_paths(profiles_dir)
 
     qmd_detected = False
@@ -129,9 +209,12 @@ def main() -> int:
         qmd_reason = "forced_builtin"
     elif args.force_backend == "qmd":
         selected_backend = "qmd"
-        qmd_detected, qmd_reason = detect_qmd(args.qmd_command, args.qmd_timeout_seconds)
+        qmd_detected = True
+        qmd_reason = "forced_qmd_not_probed"
     else:
-        qmd_detected, qmd_reason = detect_qmd(args.qmd_command, args.qmd_timeout_seconds)
+        qmd_detected, qmd_reason = _cached_detect_qmd(
+            workspace, args.qmd_command, args.qmd_timeout_seconds, persist=args.apply and not args.dry_run
+        )
         selected_backend = "qmd" if qmd_detected else "builtin"
 
     selected_profile_path = qmd_profile if selected_backend == "qmd" else builtin_profile
@@ -145,13 +228,12 @@ def main() -> int:
     backup_created = ""
     if args.target_config:
         target_config = Path(args.target_config).expanduser().resolve()
-        current: Dict[str, Any] = {}
-        if target_config.exists():
-            current = load_json(target_config)
-        merged = deep_merge(current, selected_profile)
         merged_target = str(target_config)
         if args.apply and not args.dry_run:
-            if target_config.exists() and not args.no_backup:
+            target_exists = target_config.exists()
+            current: Dict[str, Any] = load_json(target_config) if target_exists else {}
+            merged = deep_merge(current, selected_profile)
+            if target_exists and not args.no_backup:
                 backup_created = str(backup_file(target_config))
             write_json(target_config, merged)
 
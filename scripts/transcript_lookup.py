@@ -5,13 +5,17 @@ from __future__ import annotations
 
 import argparse
 import datetime as dt
-import json
+import functools
+import heapq
+import os
 import re
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, FrozenSet, List, Tuple
 
 from memory_lib import (
     DEFAULT_TRANSCRIPT_ROOT,
+    TOKEN_RE,
+    dumps_json,
     ensure_workspace_layout,
     is_under_root,
     parse_date_from_filename,
@@ -19,27 +23,48 @@ from memory_lib import (
     resolve_transcript_root,
 )
 
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - optional speedup
+    ahocorasick = None
+
+
+SECTION_HEADER_RE = re.compile(r"^## (.*)$", re.MULTILINE)
+
 
 def tokenize(text: str) -> List[str]:
-    return re.findall(r"[a-z0-9_]+", text.lower())
+    return TOKEN_RE.findall(text.lower())
 
 
 def parse_transcript_sections(path: Path) -> List[Dict]:
-    lines = path.read_text(encoding="utf-8").splitlines()
-    sections: List[Dict] = []
-    current = None
-    for line in lines:
-        if line.startswith("## "):
-            if current:
-                sections.append(current)
-            current = {"header": line[3:].strip(), "body_lines": []}
-        elif current is not None:
-            current["body_lines"].append(line)
-    if current:
-        sections.append(current)
-    for sec in sections:
-        sec["body"] = "\n".join(sec.pop("body_lines")).strip()
-    return sections
+    # Rejoining splitlines() output leaves "\n" as the only separator, so MULTILINE anchors see the same lines.
+    text = "\n".join(path.read_text(encoding="utf-8").splitlines())
+    parts = SECTION_HEADER_RE.split(text)
+    return [
+        {"header": header.strip(), "body": body.strip()}
+        for header, body in zip(parts[1::2], parts[2::2])
+    ]
+
+
+# Keyed on mtime/size so long-lived callers (confidence_gate_flow, in-process runs) re-parse only changed files.
+# Returns (file_haystack, ((header, body, haystack), ...)); the file haystack joins every section's
+# lowered text with newlines, which topic tokens never contain, so it screens out files with no hit.
+@functools.lru_cache(maxsize=64)
+def _cached_sections(path: str, mtime_ns: int, size: int) -> Tuple[str, Tuple[Tuple[str, str, str], ...]]:
+    sections = tuple(
+        (sec["header"], sec["body"], f"{sec['header']} {sec['body']}".lower())
+        for sec in parse_transcript_sections(Path(path))
+    )
+    return "\n".join(haystack for _, _, haystack in sections), sections
+
+
+@functools.lru_cache(maxsize=8)
+def _topic_automaton(topic_tokens: FrozenSet[str]) -> ahocorasick.Automaton:
+    automaton = ahocorasick.Automaton()
+    for tok in topic_tokens:
+        automaton.add_word(tok, tok)
+    automaton.make_automaton()
+    return automaton
 
 
 def lookup_transcripts(
@@ -64,48 +89,66 @@ def lookup_transcripts(
     except OSError:
         pass
 
-    topic_tokens = set(tokenize(topic))
+    topic_tokens = frozenset(tokenize(topic))
+    automaton = _topic_automaton(topic_tokens) if ahocorasick is not None and topic_tokens else None
     cutoff = dt.date.today() - dt.timedelta(days=max(last_n_days - 1, 0))
-    results: List[Dict] = []
+    candidates: List[Tuple[int, str, str, str, str]] = []
+
+    # YYYY-MM-DD names sort lexically, so anything below the cutoff name is too old to parse.
+    cutoff_name = cutoff.isoformat()
+    with os.scandir(transcript_dir) as it:
+        names = sorted(
+            item.name
+            for item in it
+            if item.name.endswith(".md") and item.name >= cutoff_name and item.is_file(follow_symlinks=False)
+        )
 
-    for path in sorted(transcript_dir.glob("*.md")):
-        if path.is_symlink():
-            continue
+    for name in names:
+        path = transcript_dir / name
         resolved = path.resolve()
         if not is_under_root(resolved, transcript_dir):
             continue
-        day = parse_date_from_filename(path.name)
+        day = parse_date_from_filename(name)
         if not day or day < cutoff:
             continue
-        for sec in parse_transcript_sections(resolved):
-            haystack = f"{sec['header']} {sec['body']}".lower()
+        st = resolved.stat()
+        file_haystack, sections = _cached_sections(str(resolved), st.st_mtime_ns, st.st_size)
+        if not any(tok in file_haystack for tok in topic_tokens):
+            continue
+        if is_under_root(resolved, workspace):
+            source_ref = str(resolved.relative_to(workspace))
+        else:
+            try:
+                source_ref = str(resolved.relative_to(transcript_dir))
+            except ValueError:
+                source_ref = resolved.name
+        date = day.isoformat()
+        for header, body, haystack in sections:
             if not haystack.strip():
                 continue
-            score = sum(1 for tok in topic_tokens if tok in haystack)
-            if score <= 0:
-                continue
-            excerpt = redact_secrets(sec["body"].strip())
-            if len(excerpt) > max_chars_per_excerpt:
-                excerpt = excerpt[: max_chars_per_excerpt - 3].rstrip() + "..."
-            if is_under_root(resolved, workspace):
-                source_ref = str(resolved.relative_to(workspace))
+            if automaton is not None:
+                score = len({tok for _, tok in automaton.iter(haystack)})
             else:
-                try:
-                    source_ref = str(resolved.relative_to(transcript_dir))
-                except ValueError:
-                    source_ref = resolved.name
-            results.append(
-                {
-                    "date": day.isoformat(),
-                    "header": redact_secrets(sec["header"]),
-                    "score": score,
-                    "excerpt": excerpt,
-                    "source_ref": source_ref,
-                }
-            )
-
-    results.sort(key=lambda x: (x["score"], x["date"]), reverse=True)
-    return {"topic": topic, "results": results[:max_excerpts]}
+                score = sum(1 for tok in topic_tokens if tok in haystack)
+            if score > 0:
+                candidates.append((score, date, header, body, source_ref))
+
+    # nlargest keeps sorted(..., reverse=True) tie order; only the kept sections pay for redaction.
+    results: List[Dict] = []
+    for score, date, header, body, source_ref in heapq.nlargest(max_excerpts, candidates, key=lambda c: (c[0], c[1])):
+        excerpt = redact_secrets(body.strip())
+        if len(excerpt) > max_chars_per_excerpt:
+            excerpt = excerpt[: max_chars_per_excerpt - 3].rstrip() + "..."
+        results.append(
+            {
+                "date": date,
+                "header": redact_secrets(header),
+                "score": score,
+                "excerpt": excerpt,
+                "source_ref": source_ref,
+            }
+        )
+    return {"topic": topic, "results": results}
 
 
 def main() -> int:
@@ -137,7 +180,7 @@ def main() -> int:
         max_chars_per_excerpt=args.max_chars_per_excerpt,
         allow_external_transcript_root=args.allow_external_transcript_root,
     )
-    print(json.dumps(payload, indent=2))
+    print(dumps_json(payload))
     return 0
 
 
@@ -16,10 +16,11 @@ import argparse
 import datetime as dt
 import json
 import os
+import re
 import sys
 from collections import defaultdict
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Set, Tuple
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
@@ -27,10 +28,12 @@ sys.path.insert(0, str(Path(__file__).parent))
 from memory_lib import (
     MemoryEntry,
     atomic_write_text,
+    bitset_jaccard,
     ensure_workspace_layout,
     file_lock,
     parse_iso_date,
     parse_memory_file,
+    token_bitsets,
     write_memory_file,
 )
 
@@ -78,9 +81,14 @@ SUPERSEDE_HINTS = [
     "outdated",
     "obsolete",
 ]
+SUPERSEDE_HINT_RE = re.compile("|".join(map(re.escape, SUPERSEDE_HINTS)))
+# Lowest similarity at which any non-UNRELATED relation is possible.
+SUPERSEDE_MIN_SIMILARITY = 0.05
+# Without a supersede hint, REFINES is the weakest relation left.
+REFINE_MIN_SIMILARITY = 0.55
 
 
-def classify_relation_heuristic(newer: MemoryEntry, older: MemoryEntry) -> str:
+def classify_relation_heuristic(newer: MemoryEntry, older: MemoryEntry, sim: float | None = None) -> str:
     """
     Classify the relationship between a newer and older memory entry.
     
@@ -92,20 +100,34 @@ def classify_relation_heuristic(newer: MemoryEntry, older: MemoryEntry) -> str:
     """
     from memory_lib import jaccard_similarity
     
-    sim = jaccard_similarity(newer.token_set(), older.token_set())
-    body = newer.body.lower()
+    if sim is None:
+        sim = jaccard_similarity(newer.token_set(), older.token_set())
+    body = newer.body_lower()
     
     # SUPERSEDES: Contradiction/overrides - lowered threshold from 0.20 to 0.05
     # because contradictions naturally have low token overlap
-    if sim >= 0.05 and any(hint in body for hint in SUPERSEDE_HINTS):
+    if sim >= SUPERSEDE_MIN_SIMILARITY and SUPERSEDE_HINT_RE.search(body):
         return "SUPERSEDES"
     if sim >= 0.85:
         return "REINFORCES"
-    if sim >= 0.55:
+    if sim >= REFINE_MIN_SIMILARITY:
         return "REFINES"
     return "UNRELATED"
 
 
+def index_by_tag(entries: List[Tuple[Path, MemoryEntry]]) -> Tuple[Dict[str, List[int]], List[int]]:
+    """Map each tag to the positions of entries carrying it, plus the untagged positions."""
+    by_tag: Dict[str, List[int]] = defaultdict(list)
+    untagged: List[int] = []
+    for idx, (_, entry) in enumerate(entries):
+        tags = entry.tags()
+        if not tags:
+            untagged.append(idx)
+        for tag in set(tags):
+            by_tag[tag].append(idx)
+    return by_tag, untagged
+
+
 def load_semantic_entries(workspace: Path) -> List[Tuple[Path, str, List[MemoryEntry]]]:
     """Load all semantic memory entries from the workspace."""
     semantic_dir = workspace / "memory" / "semantic"
@@ -319,28 +341,56 @@ def run_legacy_review(
     changed = 0
     relation_counts = defaultdict(int)
     
-    for _, new_entry in recent:
+    older_by_tag, untagged_older = index_by_tag(older)
+    bits = token_bitsets(entry.token_set() for _, entry in recent + older)
+    recent_bits, older_bits = bits[: len(recent)], bits[len(recent) :]
+    recent_sizes = [len(entry.token_set()) for _, entry in recent]
+    older_sizes = [len(entry.token_set()) for _, entry in older]
+    dirty: Set[Path] = set()
+    retired: Set[int] = set()
+    for pos, (new_path, new_entry) in enumerate(recent):
         new_tags = set(new_entry.tags())
-        for _, old_entry in older:
-            if old_entry.meta.get("status", "active") == "historical":
+        if new_tags:
+            # Both-tagged pairs with disjoint tags are never compared; keep original order for stable output.
+            candidates = sorted(
+                {idx for tag in new_tags for idx in older_by_tag.get(tag, ())}.union(untagged_older)
+            )
+        else:
+            candidates = range(len(older))
+        new_size = recent_sizes[pos]
+        has_hint = SUPERSEDE_HINT_RE.search(new_entry.body_lower()) is not None
+        floor = SUPERSEDE_MIN_SIMILARITY if has_hint else REFINE_MIN_SIMILARITY
+        for idx in candidates:
+            # Older entries only turn historical by being superseded in this loop.
+            if idx in retired:
                 continue
-            old_tags = set(old_entry.tags())
-            if new_tags and old_tags and not (new_tags & old_tags):
+            old_size = older_sizes[idx]
+            small, large = (new_size, old_size) if new_size <= old_size else (old_size, new_size)
+            # Jaccard never exceeds small/large, so lopsided pairs cannot reach this entry's weakest relation.
+            if not small or small / large < floor:
+                relation_counts["UNRELATED"] += 1
                 continue
-            relation = classify_relation_heuristic(new_entry, old_entry)
+            old_path, old_entry = older[idx]
+            relation = classify_relation_heuristic(
+                new_entry, old_entry, bitset_jaccard(recent_bits[pos], older_bits[idx])
+            )
             relation_counts[relation] += 1
             if relation == "SUPERSEDES":
+                retired.add(idx)
                 old_entry.meta["status"] = "historical"
                 new_entry.meta["supersedes"] = f"mem:{old_entry.entry_id}"
+                dirty.update((new_path, old_path))
                 changed += 1
                 actions.append(
                     f"- {now.date().isoformat()} SUPERSEDES new=mem:{new_entry.entry_id} "
                     f"old=mem:{old_entry.entry_id}"
                 )
     
-    if changed and not dry_run:
+    if dirty and not dry_run:
+        # Only files holding a re-statused or re-linked entry are rewritten.
         for path, (preamble, entries) in by_file.items():
-            write_memory_file(path, preamble, entries)
+            if path in dirty:
+                write_memory_file(path, preamble, entries)
     
     return changed, dict(relation_counts), actions
 
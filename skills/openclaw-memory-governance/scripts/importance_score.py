@@ -5,10 +5,26 @@ from __future__ import annotations
 
 import argparse
 import datetime as dt
+import functools
+import hashlib
+import heapq
 import json
+import os
 import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Any, Dict, FrozenSet, List, Tuple
+
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - optional speedup
+    ahocorasick = None
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional speedup
+    np = None
 
 from memory_lib import (
     MemoryEntry,
@@ -16,10 +32,11 @@ from memory_lib import (
     ensure_workspace_layout,
     file_lock,
     is_under_root,
+    markdown_entries,
     normalize_text,
     parse_date_from_filename,
     parse_iso_date,
-    parse_memory_file,
+    parse_memory_text,
     write_memory_file,
 )
 
@@ -27,6 +44,15 @@ PREFERENCE_TAGS = {"preference", "style", "workflow", "tooling"}
 PROJECT_TAGS = {"project", "openclaw", "memory", "architecture", "decision", "policy", "constraint"}
 UTILITY_TAGS = {"architecture", "policy", "constraint", "workflow", "decision", "preference", "process"}
 DURABILITY_ORDER = {"transient": 0, "project-stable": 1, "foundational": 2}
+_TAG_BITS = {tag: 1 << idx for idx, tag in enumerate(sorted(PREFERENCE_TAGS | PROJECT_TAGS | UTILITY_TAGS))}
+_PREFERENCE_MASK = sum(_TAG_BITS[tag] for tag in PREFERENCE_TAGS)
+_PROJECT_MASK = sum(_TAG_BITS[tag] for tag in PROJECT_TAGS)
+_UTILITY_MASK = sum(_TAG_BITS[tag] for tag in UTILITY_TAGS)
+SIGNAL_META_KEYS = ("score_goal", "score_recurrence", "score_future", "score_preference", "score_novelty")
+VECTORIZE_MIN_CANDIDATES = 64
+RESCORE_INTERVAL_DAYS = {"transient": 1, "project-stable": 3, "foundational": 7}
+# Alias map frozen once per run: its cached hash keys the compiled matchers below.
+AliasItems = FrozenSet[Tuple[str, str]]
 
 
 def clamp(value: float, low: float = 0.0, high: float = 1.0) -> float:
@@ -50,16 +76,71 @@ def parse_aliases(path: Path) -> Dict[str, str]:
     return {k: v for k, v in aliases.items() if k and v}
 
 
-def canonicalize_text(value: str, aliases: Dict[str, str]) -> str:
-    out = normalize_text(value)
-    for alias, canonical in sorted(aliases.items(), key=lambda x: len(x[0]), reverse=True):
-        if not alias:
+@functools.lru_cache(maxsize=8)
+def _alias_pattern(alias_items: AliasItems) -> Tuple[re.Pattern[str], Dict[str, str]] | None:
+    mapping = dict(alias_items)
+    names = sorted((alias for alias in mapping if alias), key=len, reverse=True)
+    if not names:
+        return None
+    return re.compile(r"(?<!\w)(" + "|".join(re.escape(alias) for alias in names) + r")(?!\w)"), mapping
+
+
+@functools.lru_cache(maxsize=8)
+def _alias_automaton(alias_items: AliasItems) -> ahocorasick.Automaton | None:
+    automaton = ahocorasick.Automaton()
+    for alias, canonical in alias_items:
+        if alias:
+            automaton.add_word(alias, (len(alias), canonical))
+    if len(automaton) == 0:
+        return None
+    automaton.make_automaton()
+    return automaton
+
+
+def _replace_aliases(text: str, automaton: ahocorasick.Automaton) -> str:
+    # Normalized text only holds [a-z0-9_] tokens separated by single spaces.
+    best: Dict[int, Tuple[int, str]] = {}
+    last = len(text) - 1
+    for end, (length, canonical) in automaton.iter(text):
+        start = end - length + 1
+        if (start > 0 and text[start - 1] != " ") or (end < last and text[end + 1] != " "):
             continue
-        out = re.sub(rf"(?<!\w){re.escape(alias)}(?!\w)", canonical, out)
+        current = best.get(start)
+        if current is None or length > current[0]:
+            best[start] = (length, canonical)
+    if not best:
+        return text
+    parts: List[str] = []
+    pos = 0
+    for start in sorted(best):
+        if start < pos:
+            continue
+        length, canonical = best[start]
+        parts.append(text[pos:start])
+        parts.append(canonical)
+        pos = start + length
+    parts.append(text[pos:])
+    return "".join(parts)
+
+
+def canonicalize_text(value: str, aliases: AliasItems) -> str:
+    out = normalize_text(value)
+    if not aliases:
+        return out
+    if ahocorasick is not None:
+        automaton = _alias_automaton(aliases)
+        if automaton is None:
+            return out
+        return normalize_text(_replace_aliases(out, automaton))
+    compiled = _alias_pattern(aliases)
+    if compiled is None:
+        return out
+    pattern, mapping = compiled
+    out = pattern.sub(lambda m: mapping[m.group(1)], out)
     return normalize_text(out)
 
 
-def canonicalize_tags(tags: List[str], aliases: Dict[str, str]) -> List[str]:
+def canonicalize_tags(tags: List[str], aliases: AliasItems) -> List[str]:
     out: List[str] = []
     seen = set()
     for raw in tags:
@@ -68,16 +149,23 @@ def canonicalize_tags(tags: List[str], aliases: Dict[str, str]) -> List[str]:
             continue
         if norm in seen:
             continue
+        norm = sys.intern(norm)
         seen.add(norm)
         out.append(norm)
     return out
 
 
-def infer_scope(tags: List[str], body: str, existing: str) -> str:
+def tag_mask(tags: List[str]) -> int:
+    mask = 0
+    for tag in tags:
+        mask |= _TAG_BITS.get(tag, 0)
+    return mask
+
+
+def infer_scope(tags: List[str], body_lower: str, existing: str) -> str:
     if existing in {"project", "global", "personal"}:
         return existing
     lowered = set(tags)
-    body_lower = body.lower()
     if lowered & PREFERENCE_TAGS or "prefer" in body_lower:
         return "personal"
     if lowered & PROJECT_TAGS or "openclaw" in body_lower:
@@ -85,11 +173,10 @@ def infer_scope(tags: List[str], body: str, existing: str) -> str:
     return "global"
 
 
-def infer_durability(tags: List[str], body: str, existing: str) -> str:
+def infer_durability(tags: List[str], body_lower: str, existing: str) -> str:
     if existing in DURABILITY_ORDER:
         return existing
     lowered = set(tags)
-    body_lower = body.lower()
     if lowered & {"identity", "principle", "foundational"} or "core identity" in body_lower:
         return "foundational"
     if lowered & (UTILITY_TAGS | PROJECT_TAGS):
@@ -97,12 +184,13 @@ def infer_durability(tags: List[str], body: str, existing: str) -> str:
     return "transient"
 
 
-def concept_key(entry: MemoryEntry, aliases: Dict[str, str]) -> str:
+def concept_key(entry: MemoryEntry, aliases: AliasItems, tags: List[str] | None = None) -> str:
     canon_body = canonicalize_text(entry.body, aliases)
-    tags = canonicalize_tags(entry.tags(), aliases)
+    if tags is None:
+        tags = canonicalize_tags(entry.tags(), aliases)
     if tags:
-        return f"{canon_body} :: {' '.join(tags)}"
-    return canon_body
+        return sys.intern(f"{canon_body} :: {' '.join(tags)}")
+    return sys.intern(canon_body)
 
 
 def parse_month_stem(name: str) -> dt.date | None:
@@ -113,57 +201,133 @@ def parse_month_stem(name: str) -> dt.date | None:
         return None
 
 
-def load_candidate_entries(
-    workspace: Path,
-    now: dt.datetime,
-    window_days: int,
-) -> List[Tuple[Path, str, List[MemoryEntry]]]:
+def _read_text(path: Path) -> str:
+    return path.read_text(encoding="utf-8")
+
+
+def candidate_paths(workspace: Path, now: dt.datetime, window_days: int) -> List[Path]:
     cutoff_day = (now - dt.timedelta(days=window_days)).date()
-    bundles: List[Tuple[Path, str, List[MemoryEntry]]] = []
+    paths: List[Path] = []
 
     episodic_dir = workspace / "memory" / "episodic"
     episodic_dir.mkdir(parents=True, exist_ok=True)
-    for path in sorted(episodic_dir.glob("*.md")):
-        day = parse_date_from_filename(path.name)
+    for item in markdown_entries(episodic_dir):
+        day = parse_date_from_filename(item.name)
         if day and day < cutoff_day:
             continue
-        preamble, entries = parse_memory_file(path)
-        bundles.append((path, preamble, entries))
+        paths.append(episodic_dir / item.name)
 
     semantic_dir = workspace / "memory" / "semantic"
     semantic_dir.mkdir(parents=True, exist_ok=True)
     cutoff_month = dt.date(cutoff_day.year, cutoff_day.month, 1)
-    for path in sorted(semantic_dir.glob("*.md")):
-        month = parse_month_stem(path.name)
+    for item in markdown_entries(semantic_dir):
+        month = parse_month_stem(item.name)
         if month and month < cutoff_month:
             continue
-        preamble, entries = parse_memory_file(path)
-        bundles.append((path, preamble, entries))
+        paths.append(semantic_dir / item.name)
+    return paths
+
+
+def load_candidate_entries(paths: List[Path]) -> List[Tuple[Path, str, List[MemoryEntry]]]:
+    if len(paths) > 1:
+        with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 4)) as pool:
+            texts = list(pool.map(_read_text, paths))
+    else:
+        texts = [_read_text(path) for path in paths]
 
+    bundles: List[Tuple[Path, str, List[MemoryEntry]]] = []
+    for path, text in zip(paths, texts):
+        preamble, entries = parse_memory_text(text)
+        bundles.append((path, preamble, entries))
     return bundles
 
 
-def compute_score(
+def score_fingerprint(body: str, tags: List[str], recurrence_count: int) -> str:
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(body.encode("utf-8"))
+    digest.update(b"\x00")
+    digest.update("\x1f".join(tags).encode("utf-8"))
+    digest.update(b"\x00")
+    digest.update(str(recurrence_count).encode("ascii"))
+    return digest.hexdigest()
+
+
+def stored_signals(entry: MemoryEntry) -> Tuple[float, ...] | None:
+    values: List[float] = []
+    for key in SIGNAL_META_KEYS:
+        try:
+            values.append(float(entry.meta[key]))
+        except (KeyError, ValueError):
+            return None
+    return tuple(values)
+
+
+def score_inputs(
     entry: MemoryEntry,
     concept_counts: Dict[str, int],
     concept_first_seen: Dict[str, dt.datetime],
-    aliases: Dict[str, str],
+    aliases: AliasItems,
     now: dt.datetime,
-    half_life_days: int,
-    alpha: float,
-) -> Tuple[float, Dict[str, float], List[str], str, str]:
-    tags = canonicalize_tags(entry.tags(), aliases)
-    body = entry.body
-    key = concept_key(entry, aliases)
+    precomputed: Dict[int, Tuple[str, List[str], int]] | None = None,
+) -> Tuple[Tuple[float, ...], float, List[str], str, str, str]:
+    cached = precomputed.get(id(entry)) if precomputed else None
+    if cached is None:
+        tags = canonicalize_tags(entry.tags(), aliases)
+        key = concept_key(entry, aliases, tags)
+        mask = tag_mask(tags)
+    else:
+        key, tags, mask = cached
     recurrence_count = concept_counts.get(key, 1)
     first_seen = concept_first_seen.get(key, now)
+    fingerprint = score_fingerprint(entry.body, tags, recurrence_count)
+
+    # Unchanged non-transient entries keep their stored signals; only decay and smoothing are refreshed.
+    reused = None
+    existing_scope = entry.meta.get("scope", "").strip().lower()
+    existing_durability = entry.meta.get("durability", "").strip().lower()
+    if (
+        fingerprint == entry.meta.get("score_fingerprint")
+        and existing_scope in {"project", "global", "personal"}
+        and existing_durability in {"project-stable", "foundational"}
+    ):
+        reused = stored_signals(entry)
+
+    if reused is not None:
+        values = reused
+        scope = existing_scope
+        durability = existing_durability
+    else:
+        body_lower = entry.body_lower()
+        goal_relevance = 0.78 if (mask & _PROJECT_MASK or "openclaw" in body_lower) else 0.45
+        recurrence = clamp((recurrence_count - 1) / 4.0)
+        future_utility = 0.8 if (mask & _UTILITY_MASK) else 0.45
+        preference_signal = 0.85 if (mask & _PREFERENCE_MASK or "prefer" in body_lower) else 0.2
+        novelty = 0.95 if recurrence_count <= 1 else clamp(1.0 - ((recurrence_count - 1) / 6.0), 0.15, 1.0)
+        values = (goal_relevance, recurrence, future_utility, preference_signal, novelty)
+        scope = infer_scope(tags, body_lower, existing_scope)
+        durability = infer_durability(tags, body_lower, existing_durability)
 
-    goal_relevance = 0.78 if (set(tags) & PROJECT_TAGS or "openclaw" in body.lower()) else 0.45
-    recurrence = clamp((recurrence_count - 1) / 4.0)
-    future_utility = 0.8 if (set(tags) & UTILITY_TAGS) else 0.45
-    preference_signal = 0.85 if (set(tags) & PREFERENCE_TAGS or "prefer" in body.lower()) else 0.2
-    novelty = 0.95 if recurrence_count <= 1 else clamp(1.0 - ((recurrence_count - 1) / 6.0), 0.15, 1.0)
+    age_days = max((now - first_seen).total_seconds() / 86400.0, 0.0)
+    return values, age_days, tags, scope, durability, fingerprint
 
+
+def previous_importance(entry: MemoryEntry) -> float | None:
+    try:
+        return float(entry.meta["importance"])
+    except (KeyError, ValueError):
+        return None
+
+
+def blend_score(
+    values: Tuple[float, ...],
+    age_days: float,
+    durability: str,
+    half_life_days: int,
+    alpha: float,
+    old_importance: float | None,
+    historical: bool,
+) -> Tuple[float, float, float, float]:
+    goal_relevance, recurrence, future_utility, preference_signal, novelty = values
     raw = (
         0.35 * goal_relevance
         + 0.20 * recurrence
@@ -171,11 +335,6 @@ def compute_score(
         + 0.15 * preference_signal
         + 0.10 * novelty
     )
-
-    scope = infer_scope(tags, body, entry.meta.get("scope", "").strip().lower())
-    durability = infer_durability(tags, body, entry.meta.get("durability", "").strip().lower())
-
-    age_days = max((now - first_seen).total_seconds() / 86400.0, 0.0)
     if durability == "foundational":
         decay = 1.0
     elif durability == "project-stable":
@@ -184,11 +343,65 @@ def compute_score(
         decay = 0.5 ** (age_days / max(half_life_days, 1))
 
     target = clamp(raw * decay)
-    old_importance = entry.get_float("importance", target)
+    if old_importance is None:
+        old_importance = target
     new_importance = clamp((1.0 - alpha) * old_importance + alpha * target)
-    if entry.meta.get("status", "active") == "historical":
+    if historical:
         new_importance = clamp(new_importance * 0.65)
+    return new_importance, raw, decay, target
+
 
+def blend_scores_vectorized(
+    rows: List[Tuple[Tuple[float, ...], float, str, float | None, bool]],
+    half_life_days: int,
+    alpha: float,
+) -> List[float]:
+    values = np.array([row[0] for row in rows], dtype=float)
+    ages = np.array([row[1] for row in rows], dtype=float)
+    durabilities = np.array([row[2] for row in rows])
+    missing = np.array([row[3] is None for row in rows], dtype=bool)
+    old = np.array([0.0 if row[3] is None else row[3] for row in rows], dtype=float)
+    historical = np.array([row[4] for row in rows], dtype=bool)
+
+    raw = (
+        0.35 * values[:, 0]
+        + 0.20 * values[:, 1]
+        + 0.20 * values[:, 2]
+        + 0.15 * values[:, 3]
+        + 0.10 * values[:, 4]
+    )
+    half_lives = np.where(durabilities == "project-stable", max(half_life_days * 2, 1), max(half_life_days, 1))
+    decay = np.where(durabilities == "foundational", 1.0, 0.5 ** (ages / half_lives))
+    target = np.clip(raw * decay, 0.0, 1.0)
+    old = np.where(missing, target, old)
+    new_importance = np.clip((1.0 - alpha) * old + alpha * target, 0.0, 1.0)
+    new_importance = np.where(historical, np.clip(new_importance * 0.65, 0.0, 1.0), new_importance)
+    return new_importance.tolist()
+
+
+def compute_score(
+    entry: MemoryEntry,
+    concept_counts: Dict[str, int],
+    concept_first_seen: Dict[str, dt.datetime],
+    aliases: AliasItems,
+    now: dt.datetime,
+    half_life_days: int,
+    alpha: float,
+    precomputed: Dict[int, Tuple[str, List[str], int]] | None = None,
+) -> Tuple[float, Dict[str, float], List[str], str, str, str]:
+    values, age_days, tags, scope, durability, fingerprint = score_inputs(
+        entry, concept_counts, concept_first_seen, aliases, now, precomputed
+    )
+    new_importance, raw, decay, target = blend_score(
+        values,
+        age_days,
+        durability,
+        half_life_days,
+        alpha,
+        previous_importance(entry),
+        entry.meta.get("status", "active") == "historical",
+    )
+    goal_relevance, recurrence, future_utility, preference_signal, novelty = values
     signals = {
         "goal_relevance": round(goal_relevance, 4),
         "recurrence": round(recurrence, 4),
@@ -199,18 +412,64 @@ def compute_score(
         "decay": round(decay, 4),
         "target": round(target, 4),
     }
-    return new_importance, signals, tags, scope, durability
+    return new_importance, signals, tags, scope, durability, fingerprint
 
 
-def should_rescore(entry: MemoryEntry, now: dt.datetime) -> bool:
+def next_rescore_at(entry: MemoryEntry) -> dt.datetime | None:
     last_scored = parse_iso_date(entry.meta.get("last_scored_at", ""))
     if last_scored is None:
-        return True
+        return None
     if last_scored.tzinfo is None:
         last_scored = last_scored.replace(tzinfo=dt.timezone.utc)
     durability = entry.meta.get("durability", "").strip().lower()
-    interval_days = {"transient": 1, "project-stable": 3, "foundational": 7}.get(durability, 2)
-    return (now - last_scored) >= dt.timedelta(days=interval_days)
+    return last_scored + dt.timedelta(days=RESCORE_INTERVAL_DAYS.get(durability, 2))
+
+
+def should_rescore(entry: MemoryEntry, now: dt.datetime) -> bool:
+    due = next_rescore_at(entry)
+    return due is None or now >= due
+
+
+def window_file_state(paths: List[Path]) -> Dict[str, List[int]]:
+    state: Dict[str, List[int]] = {}
+    for path in paths:
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            continue
+        state[str(path)] = [st.st_mtime_ns, st.st_size]
+    return state
+
+
+def load_checkpoint(path: Path) -> Dict[str, Any]:
+    if not path.exists():
+        return {}
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return payload if isinstance(payload, dict) else {}
+
+
+def window_unchanged(
+    checkpoint: Dict[str, Any],
+    file_state: Dict[str, List[int]],
+    scoring_inputs: Dict[str, Any],
+    now: dt.datetime,
+) -> bool:
+    if "next_due_at" not in checkpoint or checkpoint.get("files") != file_state:
+        return False
+    if any(checkpoint.get(key) != value for key, value in scoring_inputs.items()):
+        return False
+    next_due = checkpoint["next_due_at"]
+    if next_due is None:
+        return True
+    due = parse_iso_date(str(next_due))
+    if due is None:
+        return False
+    if due.tzinfo is None:
+        due = due.replace(tzinfo=dt.timezone.utc)
+    return now < due
 
 
 def main() -> int:
@@ -248,7 +507,7 @@ def main() -> int:
                 "Refusing alias file outside workspace. Keep alias file under workspace/, "
                 "or run from a workspace-local alias path."
             )
-        aliases = parse_aliases(alias_path)
+        aliases = frozenset(parse_aliases(alias_path).items())
         checkpoint_path = (workspace / args.checkpoint_file).resolve()
         if not is_under_root(checkpoint_path, workspace):
             raise SystemExit(
@@ -256,45 +515,94 @@ def main() -> int:
                 "or run from a workspace-local checkpoint path."
             )
 
-        bundles = load_candidate_entries(workspace, now=now, window_days=args.window_days)
+        # Anything that feeds the scores must match the checkpoint before a run may be skipped.
+        scoring_inputs = {
+            "max_updates": args.max_updates,
+            "window_days": args.window_days,
+            "half_life_days": args.half_life_days,
+            "alpha": args.alpha,
+            "alias_file": str(alias_path),
+            "alias_state": window_file_state([alias_path]).get(str(alias_path)),
+        }
+        window_paths = candidate_paths(workspace, now=now, window_days=args.window_days)
+        checkpoint = load_checkpoint(checkpoint_path)
+        if window_unchanged(checkpoint, window_file_state(window_paths), scoring_inputs, now):
+            if not args.dry_run:
+                checkpoint["last_run_at"] = now.replace(microsecond=0).isoformat().replace("+00:00", "Z")
+                checkpoint["updated"] = 0
+                atomic_write_text(checkpoint_path, json.dumps(checkpoint, indent=2) + "\n", encoding="utf-8")
+            print("importance_score skipped=unchanged")
+            return 0
+
+        bundles = load_candidate_entries(window_paths)
         all_entries: List[Tuple[Path, str, List[MemoryEntry], int, MemoryEntry]] = []
-        concept_counts: Dict[str, int] = {}
-        concept_first_seen: Dict[str, dt.datetime] = {}
+        precomputed: Dict[int, Tuple[str, List[str], int]] = {}
+        entry_times: Dict[int, dt.datetime | None] = {}
         for path, preamble, entries in bundles:
             for idx, entry in enumerate(entries):
-                key = concept_key(entry, aliases)
+                tags = canonicalize_tags(entry.tags(), aliases)
+                key = concept_key(entry, aliases, tags)
                 if not key:
                     continue
-                ts = parse_iso_date(entry.meta.get("time", "")) or now
-                if ts.tzinfo is None:
-                    ts = ts.replace(tzinfo=dt.timezone.utc)
-                concept_counts[key] = concept_counts.get(key, 0) + 1
-                first = concept_first_seen.get(key)
-                if first is None or ts < first:
-                    concept_first_seen[key] = ts
+                precomputed[id(entry)] = (key, tags, tag_mask(tags))
+                entry_times[id(entry)] = parse_iso_date(entry.meta.get("time", ""))
                 all_entries.append((path, preamble, entries, idx, entry))
 
         candidates = [item for item in all_entries if should_rescore(item[4], now=now)]
-        candidates.sort(
-            key=lambda x: (
-                parse_iso_date(x[4].meta.get("last_scored_at", "")) or dt.datetime(1970, 1, 1, tzinfo=dt.timezone.utc),
-                parse_iso_date(x[4].meta.get("time", "")) or dt.datetime(1970, 1, 1, tzinfo=dt.timezone.utc),
+        epoch = dt.datetime(1970, 1, 1, tzinfo=dt.timezone.utc)
+        decorated = [
+            (
+                parse_iso_date(item[4].meta.get("last_scored_at", "")) or epoch,
+                entry_times.get(id(item[4])) or epoch,
+                item,
             )
-        )
-        candidates = candidates[: max(args.max_updates, 0)]
+            for item in candidates
+        ]
+        selected = heapq.nsmallest(max(args.max_updates, 0), decorated, key=lambda d: (d[0], d[1]))
+        candidates = [d[2] for d in selected]
 
-        changed_paths: Dict[Path, Tuple[str, List[MemoryEntry]]] = {path: (preamble, entries) for path, preamble, entries in bundles}
-        updated = 0
-        for path, _, entries, idx, entry in candidates:
-            new_importance, signals, tags, scope, durability = compute_score(
-                entry=entry,
-                concept_counts=concept_counts,
-                concept_first_seen=concept_first_seen,
-                aliases=aliases,
-                now=now,
-                half_life_days=max(args.half_life_days, 1),
-                alpha=clamp(args.alpha, 0.01, 1.0),
+        candidate_keys = {precomputed[id(item[4])][0] for item in candidates}
+        concept_counts: Dict[str, int] = {}
+        concept_first_seen: Dict[str, dt.datetime] = {}
+        for item in all_entries:
+            entry = item[4]
+            key = precomputed[id(entry)][0]
+            if key not in candidate_keys:
+                continue
+            ts = entry_times[id(entry)] or now
+            if ts.tzinfo is None:
+                ts = ts.replace(tzinfo=dt.timezone.utc)
+            concept_counts[key] = concept_counts.get(key, 0) + 1
+            first = concept_first_seen.get(key)
+            if first is None or ts < first:
+                concept_first_seen[key] = ts
+
+        bundles_by_path: Dict[Path, Tuple[str, List[MemoryEntry]]] = {path: (preamble, entries) for path, preamble, entries in bundles}
+        dirty_paths: Dict[Path, None] = {}
+        half_life_days = max(args.half_life_days, 1)
+        alpha = clamp(args.alpha, 0.01, 1.0)
+        inputs = [
+            score_inputs(item[4], concept_counts, concept_first_seen, aliases, now, precomputed) for item in candidates
+        ]
+        rows = [
+            (
+                values,
+                age_days,
+                durability,
+                previous_importance(item[4]),
+                item[4].meta.get("status", "active") == "historical",
             )
+            for item, (values, age_days, _, _, durability, _) in zip(candidates, inputs)
+        ]
+        if np is not None and len(rows) > VECTORIZE_MIN_CANDIDATES:
+            importances = blend_scores_vectorized(rows, half_life_days, alpha)
+        else:
+            importances = [blend_score(row[0], row[1], row[2], half_life_days, alpha, row[3], row[4])[0] for row in rows]
+
+        updated = 0
+        for (path, _, entries, idx, entry), new_importance, (values, _, tags, scope, durability, fingerprint) in zip(
+            candidates, importances, inputs
+        ):
             target = entries[idx]
             target.meta["importance"] = f"{new_importance:.2f}"
             target.meta["tags"] = str(tags)
@@ -303,22 +611,26 @@ def main() -> int:
             target.meta["last_scored_at"] = now.replace(microsecond=0).isoformat().replace("+00:00", "Z")
             if "valid_until" not in target.meta:
                 target.meta["valid_until"] = "none"
-            target.meta["score_goal"] = f"{signals['goal_relevance']:.4f}"
-            target.meta["score_recurrence"] = f"{signals['recurrence']:.4f}"
-            target.meta["score_future"] = f"{signals['future_utility']:.4f}"
-            target.meta["score_preference"] = f"{signals['preference_signal']:.4f}"
-            target.meta["score_novelty"] = f"{signals['novelty']:.4f}"
+            for meta_key, value in zip(SIGNAL_META_KEYS, values):
+                target.meta[meta_key] = repr(value)
+            target.meta["score_fingerprint"] = fingerprint
+            dirty_paths[path] = None
             updated += 1
 
         if not args.dry_run:
-            for path, (preamble, entries) in changed_paths.items():
-                write_memory_file(path, preamble, entries)
+            for path in dirty_paths:
+                write_memory_file(path, *bundles_by_path[path])
+            due_times = [next_rescore_at(item[4]) for item in all_entries]
+            if any(due is None for due in due_times):
+                next_due = now
+            else:
+                next_due = min(due_times, default=None)
             checkpoint_payload = {
                 "last_run_at": now.replace(microsecond=0).isoformat().replace("+00:00", "Z"),
                 "updated": updated,
-                "max_updates": args.max_updates,
-                "window_days": args.window_days,
-                "alias_file": str(alias_path),
+                **scoring_inputs,
+                "next_due_at": next_due.replace(microsecond=0).isoformat().replace("+00:00", "Z") if next_due else None,
+                "files": window_file_state(window_paths),
             }
             atomic_write_text(checkpoint_path, json.dumps(checkpoint_payload, indent=2) + "\n", encoding="utf-8")
 
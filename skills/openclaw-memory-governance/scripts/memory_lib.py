@@ -3,23 +3,35 @@
 
 from __future__ import annotations
 
-import ast
 import datetime as dt
+import functools
+import json
 import os
 import re
+import stat
+import sys
 import tempfile
 import uuid
 from contextlib import contextmanager
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import AbstractSet, Any, Dict, FrozenSet, Iterable, List, Tuple
 
 try:
     import fcntl
 except ImportError:  # pragma: no cover - unavailable on Windows
     fcntl = None
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
 ENTRY_RE = re.compile(r"^###\s+mem:([a-zA-Z0-9_-]+)\s*$")
+ENTRY_SPLIT_RE = re.compile(r"^###[^\S\n]+mem:([a-zA-Z0-9_-]+)[^\S\n]*$", re.MULTILINE)
+TOKEN_RE = re.compile(r"[a-z0-9_]+")
+FROMISOFORMAT_ACCEPTS_Z = sys.version_info >= (3, 11)
+_popcount = int.bit_count if sys.version_info >= (3, 10) else (lambda value: bin(value).count("1"))
 DEFAULT_TRANSCRIPT_ROOT = "archive/transcripts"
 LEGACY_TRANSCRIPT_ROOT = "memory/transcripts"
 
@@ -50,6 +62,11 @@ class MemoryEntry:
     entry_id: str
     meta: Dict[str, str] = field(default_factory=dict)
     body: str = ""
+    _tags_raw: str | None = field(default=None, init=False, repr=False, compare=False)
+    _tags_cache: Tuple[str, ...] = field(default=(), init=False, repr=False, compare=False)
+    _body_raw: str | None = field(default=None, init=False, repr=False, compare=False)
+    _body_lower: str = field(default="", init=False, repr=False, compare=False)
+    _token_cache: FrozenSet[str] | None = field(default=None, init=False, repr=False, compare=False)
 
     def get_float(self, key: str, default: float) -> float:
         val = self.meta.get(key)
@@ -61,21 +78,46 @@ class MemoryEntry:
             return default
 
     def tags(self) -> List[str]:
-        raw = self.meta.get("tags", "[]").strip()
-        if not raw:
-            return []
+        raw = self.meta.get("tags", "[]")
+        if raw != self._tags_raw:
+            self._tags_cache = tuple(_parse_tags(raw))
+            self._tags_raw = raw
+        return list(self._tags_cache)
+
+    def body_lower(self) -> str:
+        if self.body != self._body_raw:
+            self._body_lower = self.body.lower()
+            self._body_raw = self.body
+            self._token_cache = None
+        return self._body_lower
+
+    def token_set(self) -> FrozenSet[str]:
+        lowered = self.body_lower()
+        if self._token_cache is None:
+            self._token_cache = frozenset(TOKEN_RE.findall(lowered))
+        return self._token_cache
+
+
+def dumps_json(payload: Any) -> str:
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_INDENT_2).decode("utf-8")
+    return json.dumps(payload, indent=2)
+
+
+def _parse_tags(raw: str) -> List[str]:
+    raw = raw.strip()
+    if not raw:
+        return []
+    if raw.startswith('["') or raw == "[]":
         try:
-            parsed = ast.literal_eval(raw)
-            if isinstance(parsed, list):
-                return [str(t).strip() for t in parsed if str(t).strip()]
-        except (SyntaxError, ValueError):
-            pass
-        if raw.startswith("[") and raw.endswith("]"):
-            raw = raw[1:-1]
-        return [x.strip().strip("\"'") for x in raw.split(",") if x.strip()]
-
-    def token_set(self) -> set[str]:
-        return set(re.findall(r"[a-z0-9_]+", self.body.lower()))
+            parsed = json.loads(raw)
+        except json.JSONDecodeError:
+            parsed = None
+        if isinstance(parsed, list):
+            return [str(t).strip() for t in parsed if str(t).strip()]
+    if raw.startswith("[") and raw.endswith("]"):
+        raw = raw[1:-1]
+    return [x.strip().strip("\"'") for x in raw.split(",") if x.strip()]
 
 
 def utc_now_z() -> str:
@@ -116,23 +158,31 @@ def resolve_transcript_root(workspace: Path, transcript_root: str) -> Path:
     return root.resolve()
 
 
+def fast_resolve(value: str) -> Path:
+    # Absolute paths without ".." skip the realpath() round trip; symlinks are kept as given.
+    path = Path(value)
+    if value.startswith("/") and ".." not in path.parts:
+        return path
+    return path.expanduser().resolve()
+
+
 def is_under_root(path: Path, root: Path) -> bool:
-    path = path.resolve()
-    root = root.resolve()
-    return path == root or root in path.parents
+    resolved = os.fspath(path.resolve())
+    root_str = os.fspath(root.resolve())
+    if resolved == root_str:
+        return True
+    prefix = root_str if root_str.endswith(os.sep) else root_str + os.sep
+    return resolved.startswith(prefix)
 
 
 def redact_secrets(text: str) -> str:
-    value = PRIVATE_KEY_BLOCK_RE.sub("<REDACTED:PRIVATE_KEY_BLOCK>", text)
+    value = text
+    if "PRIVATE KEY-----" in value:
+        value = PRIVATE_KEY_BLOCK_RE.sub("<REDACTED:PRIVATE_KEY_BLOCK>", value)
     value = BEARER_TOKEN_RE.sub("Bearer <REDACTED>", value)
-    value = OPENAI_KEY_RE.sub("<REDACTED:API_KEY>", value)
-
-    def _replace_assignment(match: re.Match[str]) -> str:
-        key = match.group(1)
-        return f"{key}=<REDACTED>"
-
-    value = GENERIC_SECRET_ASSIGNMENT_RE.sub(_replace_assignment, value)
-    return value
+    if "sk-" in value:
+        value = OPENAI_KEY_RE.sub("<REDACTED:API_KEY>", value)
+    return GENERIC_SECRET_ASSIGNMENT_RE.sub(r"\1=<REDACTED>", value)
 
 
 def transcript_file(workspace: Path, day: dt.date, transcript_root: str = DEFAULT_TRANSCRIPT_ROOT) -> Path:
@@ -140,66 +190,96 @@ def transcript_file(workspace: Path, day: dt.date, transcript_root: str = DEFAUL
     return root / f"{day.isoformat()}.md"
 
 
-def parse_memory_file(path: Path) -> Tuple[str, List[MemoryEntry]]:
-    if not path.exists():
-        return "", []
-    lines = path.read_text(encoding="utf-8").splitlines()
-    preamble: List[str] = []
+def parse_memory_text(text: str) -> Tuple[str, List[MemoryEntry]]:
+    if "\r" in text:
+        text = "\n".join(text.splitlines())
+    parts = ENTRY_SPLIT_RE.split(text)
     entries: List[MemoryEntry] = []
-    idx = 0
-    while idx < len(lines):
-        m = ENTRY_RE.match(lines[idx])
-        if not m:
-            preamble.append(lines[idx])
-            idx += 1
-            continue
-        entry_id = m.group(1)
-        idx += 1
+    for idx in range(1, len(parts), 2):
+        lines = parts[idx + 1].split("\n")
+        sep = next((i for i, line in enumerate(lines) if line.strip() == "---"), len(lines))
         meta: Dict[str, str] = {}
-        while idx < len(lines):
-            line = lines[idx].strip()
-            if line == "---":
-                idx += 1
-                break
+        for line in lines[:sep]:
             if ":" in line:
                 key, value = line.split(":", 1)
                 meta[key.strip()] = value.strip()
-            idx += 1
-        body_lines: List[str] = []
-        while idx < len(lines) and not ENTRY_RE.match(lines[idx]):
-            body_lines.append(lines[idx])
-            idx += 1
-        body = "\n".join(body_lines).strip()
-        entries.append(MemoryEntry(entry_id=entry_id, meta=meta, body=body))
-    return "\n".join(preamble).strip(), entries
+        body = "\n".join(lines[sep + 1 :]).strip()
+        entries.append(MemoryEntry(entry_id=parts[idx], meta=meta, body=body))
+    return parts[0].strip(), entries
 
 
-def render_memory_file(preamble: str, entries: List[MemoryEntry]) -> str:
-    blocks: List[str] = []
-    if preamble.strip():
-        blocks.append(preamble.strip())
-    for entry in entries:
-        lines: List[str] = [f"### mem:{entry.entry_id}"]
-        ordered_keys = [k for k in DEFAULT_META_ORDER if k in entry.meta]
-        extra_keys = [k for k in entry.meta.keys() if k not in DEFAULT_META_ORDER]
-        for key in ordered_keys + sorted(extra_keys):
-            lines.append(f"{key}: {entry.meta[key]}")
-        lines.append("---")
-        lines.append(entry.body.strip())
-        blocks.append("\n".join(lines).rstrip())
-    return "\n\n".join(blocks).rstrip() + "\n"
+def parse_memory_file(path: Path) -> Tuple[str, List[MemoryEntry]]:
+    if not path.exists():
+        return "", []
+    return parse_memory_text(path.read_text(encoding="utf-8"))
 
 
-def write_memory_file(path: Path, preamble: str, entries: List[MemoryEntry]) -> None:
-    atomic_write_text(path, render_memory_file(preamble, entries), encoding="utf-8")
+def markdown_entries(directory: Path) -> List[os.DirEntry]:
+    with os.scandir(directory) as it:
+        items = [item for item in it if item.name.endswith(".md") and not item.name.startswith(".")]
+    items.sort(key=lambda item: item.name)
+    return items
 
 
-def atomic_write_text(path: Path, text: str, encoding: str = "utf-8") -> None:
+def render_memory_file(preamble: str, entries: List[MemoryEntry]) -> str:
+    parts: List[str] = []
+    preamble = preamble.strip()
+    if preamble:
+        parts.append(preamble)
+        parts.append("\n\n")
+    for entry in entries:
+        parts.append(f"### mem:{entry.entry_id}\n")
+        meta = entry.meta
+        for key in DEFAULT_META_ORDER:
+            if key in meta:
+                parts.append(f"{key}: {meta[key]}\n")
+        for key in sorted(k for k in meta if k not in DEFAULT_META_ORDER):
+            parts.append(f"{key}: {meta[key]}\n")
+        parts.append("---")
+        body = entry.body.strip()
+        if body:
+            parts.append("\n")
+            parts.append(body)
+        parts.append("\n\n")
+    return "".join(parts).rstrip() + "\n"
+
+
+def write_memory_file(path: Path, preamble: str, entries: List[MemoryEntry], fsync: bool = False) -> None:
+    atomic_write_text(path, render_memory_file(preamble, entries), encoding="utf-8", fsync=fsync)
+
+
+@functools.lru_cache(maxsize=1)
+def default_file_mode() -> int:
+    # os.umask can only be read by setting it; done once per process.
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+def atomic_write_text(
+    path: Path,
+    text: str,
+    encoding: str = "utf-8",
+    fsync: bool = False,
+    mode: int | None = None,
+    new_file_mode: int = 0o600,
+) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", dir=str(path.parent))
     try:
         with os.fdopen(fd, "w", encoding=encoding) as fh:
             fh.write(text)
+            if fsync:
+                fh.flush()
+                os.fsync(fh.fileno())
+        # Memory files stay owner-only when new; an existing target keeps its mode across the rename.
+        if mode is None:
+            try:
+                mode = stat.S_IMODE(os.stat(path).st_mode)
+            except FileNotFoundError:
+                mode = new_file_mode
+        if mode != 0o600:
+            os.chmod(tmp_name, mode)
         os.replace(tmp_name, path)
     finally:
         try:
@@ -212,9 +292,10 @@ def atomic_write_text(path: Path, text: str, encoding: str = "utf-8") -> None:
 @contextmanager
 def file_lock(lock_path: Path):
     lock_path.parent.mkdir(parents=True, exist_ok=True)
-    handle = lock_path.open("a+", encoding="utf-8")
-    locked = False
+    handle = None
     try:
+        handle = lock_path.open("a+", encoding="utf-8")
+        locked = False
         if fcntl is None:
             locked = True
         else:
@@ -226,19 +307,20 @@ def file_lock(lock_path: Path):
                 return
         yield True
     finally:
-        if locked and fcntl is not None:
+        if locked and fcntl is not None and handle is not None:
             try:
                 fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
             except OSError:
                 pass
-        handle.close()
+        if handle is not None:
+            handle.close()
 
 
 def normalize_text(value: str) -> str:
-    return " ".join(re.findall(r"[a-z0-9_]+", value.lower()))
+    return " ".join(TOKEN_RE.findall(value.lower()))
 
 
-def jaccard_similarity(a: set[str], b: set[str]) -> float:
+def jaccard_similarity(a: AbstractSet[str], b: AbstractSet[str]) -> float:
     if not a or not b:
         return 0.0
     inter = len(a & b)
@@ -248,18 +330,39 @@ def jaccard_similarity(a: set[str], b: set[str]) -> float:
     return inter / union
 
 
+def token_bitsets(token_sets: Iterable[AbstractSet[str]]) -> List[int]:
+    # One shared vocabulary, so bitset_jaccard over the results equals jaccard_similarity over the sets.
+    ids: Dict[str, int] = {}
+    out: List[int] = []
+    for tokens in token_sets:
+        bits = 0
+        for tok in tokens:
+            bits |= 1 << ids.setdefault(tok, len(ids))
+        out.append(bits)
+    return out
+
+
+def bitset_jaccard(a: int, b: int) -> float:
+    if not a or not b:
+        return 0.0
+    return _popcount(a & b) / _popcount(a | b)
+
+
+# datetimes are immutable, so repeated timestamps (best-entry ranking, day spread, age) can share one parse.
+@functools.lru_cache(maxsize=4096)
 def parse_iso_date(value: str) -> dt.datetime | None:
     value = value.strip()
     if not value:
         return None
+    if value.endswith("Z") and not FROMISOFORMAT_ACCEPTS_Z:
+        value = value.replace("Z", "+00:00")
     try:
-        if value.endswith("Z"):
-            return dt.datetime.fromisoformat(value.replace("Z", "+00:00"))
         return dt.datetime.fromisoformat(value)
     except ValueError:
         return None
 
 
+@functools.lru_cache(maxsize=4096)
 def parse_date_from_filename(name: str) -> dt.date | None:
     base = os.path.basename(name)
     stem, _ = os.path.splitext(base)
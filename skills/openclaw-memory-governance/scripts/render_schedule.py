@@ -4,184 +4,233 @@
 from __future__ import annotations
 
 import argparse
-import plistlib
+import functools
+import os
+import re
 import shlex
+import sys
 from pathlib import Path
+from xml.sax.saxutils import escape
+
+from memory_lib import fast_resolve
+
+# Byte-for-byte the layout plistlib.dump emits for launchd job payloads.
+_PLIST_TEMPLATE = """\
+<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE plist PUBLIC "-//Apple//DTD PLIST 1.0//EN" "http://www.apple.com/DTDs/PropertyList-1.0.dtd">
+<plist version="1.0">
+<dict>
+\t<key>Label</key>
+\t<string>{label}</string>
+\t<key>ProgramArguments</key>
+\t<array>
+{args_xml}\t</array>
+\t<key>RunAtLoad</key>
+\t<{run_at_load}/>
+\t<key>StandardErrorPath</key>
+\t<string>{stderr_path}</string>
+\t<key>StandardOutPath</key>
+\t<string>{stdout_path}</string>
+\t<key>StartCalendarInterval</key>
+\t<dict>
+\t\t<key>Hour</key>
+\t\t<integer>{hour}</integer>
+\t\t<key>Minute</key>
+\t\t<integer>{minute}</integer>
+{weekday_xml}\t</dict>
+</dict>
+</plist>
+"""
+_SCRIPTS_DIR = Path(__file__).resolve().parent
+_PLIST_UNSAFE_RE = re.compile(r"[\x00-\x08\x0b\x0c\x0d\x0e-\x1f]")
+_CLI_ARGS = (
+    (("--workspace",), {"required": True, "help": "OpenClaw workspace root."}),
+    (("--agent-id",), {"default": "main", "help": "OpenClaw agent id for daily transcript mirror."}),
+    (("--launchd-dir",), {"default": "", "help": "Optional output directory for launchd plist files."}),
+)
 
 
 def cron_lines(workspace: Path, scripts_dir: Path, agent_id: str) -> list[str]:
-    logs = workspace / "memory" / "logs"
     q = shlex.quote
-    lines = [
+    scripts = str(scripts_dir)
+    logs = str(workspace / "memory" / "logs")
+    ws = q(str(workspace))
+    agent = q(agent_id)
+    py = "/usr/bin/env python3"
+
+    jobs = (
+        ("55 2 * * *", "bootstrap_profile_once.py", ("--workspace", ws), "bootstrap.log"),
         (
-            "55 2 * * * /usr/bin/env python3 "
-            f"{q(str(scripts_dir / 'bootstrap_profile_once.py'))} "
-            f"--workspace {q(str(workspace))} "
-            f">> {q(str(logs / 'bootstrap.log'))} 2>&1"
+            "5 * * * *",
+            "importance_score.py",
+            ("--workspace", ws, "--window-days", "30", "--max-updates", "400"),
+            "importance.log",
         ),
-        f"5 * * * * /usr/bin/env python3 {q(str(scripts_dir / 'importance_score.py'))} --workspace {q(str(workspace))} --window-days 30 --max-updates 400 >> {q(str(logs / 'importance.log'))} 2>&1",
-        f"0 * * * * /usr/bin/env python3 {q(str(scripts_dir / 'hourly_semantic_extract.py'))} --workspace {q(str(workspace))} >> {q(str(logs / 'hourly.log'))} 2>&1",
+        ("0 * * * *", "hourly_semantic_extract.py", ("--workspace", ws), "hourly.log"),
         (
-            "10 3 * * * /usr/bin/env python3 "
-            f"{q(str(scripts_dir / 'daily_consolidate.py'))} "
-            f"--workspace {q(str(workspace))} "
-            f"--agent-id {q(agent_id)} "
-            "--transcript-root archive/transcripts "
-            "--transcript-mode sanitized "
-            f">> {q(str(logs / 'daily.log'))} 2>&1"
+            "10 3 * * *",
+            "daily_consolidate.py",
+            (
+                "--workspace", ws, "--agent-id", agent,
+                "--transcript-root", "archive/transcripts", "--transcript-mode", "sanitized",
+            ),
+            "daily.log",
         ),
         (
-            "10 4 * * 0 /usr/bin/env python3 "
-            f"{q(str(scripts_dir / 'weekly_identity_promote.py'))} "
-            f"--workspace {q(str(workspace))} "
-            "--window-days 30 --min-importance 0.85 --min-recurrence 3 "
-            f">> {q(str(logs / 'weekly-identity.log'))} 2>&1"
+            "10 4 * * 0",
+            "weekly_identity_promote.py",
+            (
+                "--workspace", ws, "--window-days", "30",
+                "--min-importance", "0.85", "--min-recurrence", "3",
+            ),
+            "weekly-identity.log",
         ),
+        ("20 4 * * 0", "weekly_drift_review.py", ("--workspace", ws, "--window-days", "7"), "weekly-drift.log"),
         (
-            "20 4 * * 0 /usr/bin/env python3 "
-            f"{q(str(scripts_dir / 'weekly_drift_review.py'))} "
-            f"--workspace {q(str(workspace))} "
-            "--window-days 7 "
-            f">> {q(str(logs / 'weekly-drift.log'))} 2>&1"
+            "40 3 * * *",
+            "session_hygiene.py",
+            ("--agent-id", agent, "--retention-days", "30", "--skip-recent-minutes", "30"),
+            "session-hygiene.log",
         ),
-        (
-            "40 3 * * * /usr/bin/env python3 "
-            f"{q(str(scripts_dir / 'session_hygiene.py'))} "
-            f"--agent-id {q(agent_id)} "
-            "--retention-days 30 "
-            "--skip-recent-minutes 30 "
-            f">> {q(str(logs / 'session-hygiene.log'))} 2>&1"
+    )
+    return [
+        " ".join(
+            [when, py, q(os.path.join(scripts, name)), *args, ">>", q(os.path.join(logs, log)), "2>&1"]
+        )
+        for when, name, args, log in jobs
+    ]
+
+
+@functools.lru_cache(maxsize=256)
+def _xml_text(value: str) -> str:
+    return escape(value)
+
+
+def _render_plist(payload: dict) -> bytes:
+    interval = payload["StartCalendarInterval"]
+    weekday = interval.get("Weekday")
+    return _PLIST_TEMPLATE.format(
+        label=_xml_text(payload["Label"]),
+        args_xml="".join(f"\t\t<string>{_xml_text(arg)}</string>\n" for arg in payload["ProgramArguments"]),
+        run_at_load="true" if payload["RunAtLoad"] else "false",
+        stdout_path=_xml_text(payload["StandardOutPath"]),
+        stderr_path=_xml_text(payload["StandardErrorPath"]),
+        hour=int(interval["Hour"]),
+        minute=int(interval["Minute"]),
+        weekday_xml="" if weekday is None else f"\t\t<key>Weekday</key>\n\t\t<integer>{int(weekday)}</integer>\n",
+    ).encode("utf-8")
+
+
+def launchd_payloads(workspace: Path, scripts_dir: Path, agent_id: str) -> list[tuple[str, dict]]:
+    ws = str(workspace)
+    logs = str(workspace / "memory" / "logs")
+
+    def job(
+        name: str,
+        script: str,
+        hour: int,
+        minute: int,
+        weekday: int | None = None,
+        extra_args: tuple[str, ...] = (),
+        run_at_load: bool = False,
+    ) -> tuple[str, dict]:
+        label = f"com.openclaw.memory.{name}"
+        interval = {"Hour": hour, "Minute": minute}
+        if weekday is not None:
+            interval["Weekday"] = weekday
+        payload = {
+            "Label": label,
+            "ProgramArguments": [
+                "/usr/bin/env",
+                "python3",
+                os.path.join(str(scripts_dir), script),
+                "--workspace",
+                ws,
+                *extra_args,
+            ],
+            "RunAtLoad": run_at_load,
+            "StandardOutPath": os.path.join(logs, f"{label}.out.log"),
+            "StandardErrorPath": os.path.join(logs, f"{label}.err.log"),
+            "StartCalendarInterval": interval,
+        }
+        return f"{label}.plist", payload
+
+    return [
+        job("bootstrap", "bootstrap_profile_once.py", 2, 55, run_at_load=True),
+        job("importance", "importance_score.py", 0, 5, extra_args=("--window-days", "30", "--max-updates", "400")),
+        job("hourly", "hourly_semantic_extract.py", 0, 0),
+        job(
+            "daily",
+            "daily_consolidate.py",
+            3,
+            10,
+            extra_args=(
+                "--agent-id",
+                agent_id,
+                "--transcript-root",
+                "archive/transcripts",
+                "--transcript-mode",
+                "sanitized",
+            ),
+        ),
+        job(
+            "weekly-identity",
+            "weekly_identity_promote.py",
+            4,
+            10,
+            weekday=0,
+            extra_args=("--window-days", "30", "--min-importance", "0.85", "--min-recurrence", "3"),
+        ),
+        job("weekly", "weekly_drift_review.py", 4, 20, weekday=0),
+        job(
+            "session-hygiene",
+            "session_hygiene.py",
+            3,
+            40,
+            extra_args=("--agent-id", agent_id, "--retention-days", "30", "--skip-recent-minutes", "30"),
         ),
     ]
-    return lines
-
-
-def write_launchd_plist(
-    out_path: Path,
-    label: str,
-    script_path: Path,
-    workspace: Path,
-    logs_dir: Path,
-    hour: int,
-    minute: int,
-    weekday: int | None = None,
-    extra_args: list[str] | None = None,
-    run_at_load: bool = False,
-) -> None:
-    args = ["/usr/bin/env", "python3", str(script_path), "--workspace", str(workspace)]
-    if extra_args:
-        args.extend(extra_args)
-    payload = {
-        "Label": label,
-        "ProgramArguments": args,
-        "RunAtLoad": run_at_load,
-        "StandardOutPath": str(logs_dir / f"{label}.out.log"),
-        "StandardErrorPath": str(logs_dir / f"{label}.err.log"),
-        "StartCalendarInterval": {"Hour": hour, "Minute": minute},
-    }
-    if weekday is not None:
-        payload["StartCalendarInterval"]["Weekday"] = weekday
-    out_path.parent.mkdir(parents=True, exist_ok=True)
+
+
+def write_launchd_plist(out_path: Path, payload: dict) -> None:
+    values = (payload["Label"], payload["StandardOutPath"], payload["StandardErrorPath"], *payload["ProgramArguments"])
+    if not any(_PLIST_UNSAFE_RE.search(value) for value in values):
+        out_path.write_bytes(_render_plist(payload))
+        return
+    # plistlib rejects control characters and rewrites carriage returns; keep its exact behavior.
+    import plistlib
+
     with out_path.open("wb") as fh:
         plistlib.dump(payload, fh)
 
 
 def main() -> int:
     parser = argparse.ArgumentParser()
-    parser.add_argument("--workspace", required=True, help="OpenClaw workspace root.")
-    parser.add_argument("--agent-id", default="main", help="OpenClaw agent id for daily transcript mirror.")
-    parser.add_argument("--launchd-dir", default="", help="Optional output directory for launchd plist files.")
+    for flags, kwargs in _CLI_ARGS:
+        parser.add_argument(*flags, **kwargs)
     args = parser.parse_args()
 
-    scripts_dir = Path(__file__).resolve().parent
-    workspace = Path(args.workspace).expanduser().resolve()
+    scripts_dir = _SCRIPTS_DIR
+    workspace = fast_resolve(args.workspace)
     logs_dir = workspace / "memory" / "logs"
     logs_dir.mkdir(parents=True, exist_ok=True)
 
-    print("# IMPORTANT: cadence jobs do not run until you install these entries in cron/launchd")
-    print("# crontab entries")
-    for line in cron_lines(workspace, scripts_dir, agent_id=args.agent_id):
-        print(line)
+    sys.stdout.write(
+        "\n".join(
+            [
+                "# IMPORTANT: cadence jobs do not run until you install these entries in cron/launchd",
+                "# crontab entries",
+                *cron_lines(workspace, scripts_dir, agent_id=args.agent_id),
+                "",
+            ]
+        )
+    )
 
     if args.launchd_dir:
-        out = Path(args.launchd_dir).expanduser().resolve()
-        write_launchd_plist(
-            out / "com.openclaw.memory.bootstrap.plist",
-            "com.openclaw.memory.bootstrap",
-            scripts_dir / "bootstrap_profile_once.py",
-            workspace,
-            logs_dir,
-            hour=2,
-            minute=55,
-            run_at_load=True,
-        )
-        write_launchd_plist(
-            out / "com.openclaw.memory.importance.plist",
-            "com.openclaw.memory.importance",
-            scripts_dir / "importance_score.py",
-            workspace,
-            logs_dir,
-            hour=0,
-            minute=5,
-            extra_args=["--window-days", "30", "--max-updates", "400"],
-        )
-        write_launchd_plist(
-            out / "com.openclaw.memory.hourly.plist",
-            "com.openclaw.memory.hourly",
-            scripts_dir / "hourly_semantic_extract.py",
-            workspace,
-            logs_dir,
-            hour=0,
-            minute=0,
-        )
-        write_launchd_plist(
-            out / "com.openclaw.memory.daily.plist",
-            "com.openclaw.memory.daily",
-            scripts_dir / "daily_consolidate.py",
-            workspace,
-            logs_dir,
-            hour=3,
-            minute=10,
-            extra_args=[
-                "--agent-id",
-                args.agent_id,
-                "--transcript-root",
-                "archive/transcripts",
-                "--transcript-mode",
-                "sanitized",
-            ],
-        )
-        write_launchd_plist(
-            out / "com.openclaw.memory.weekly-identity.plist",
-            "com.openclaw.memory.weekly-identity",
-            scripts_dir / "weekly_identity_promote.py",
-            workspace,
-            logs_dir,
-            hour=4,
-            minute=10,
-            weekday=0,
-            extra_args=["--window-days", "30", "--min-importance", "0.85", "--min-recurrence", "3"],
-        )
-        write_launchd_plist(
-            out / "com.openclaw.memory.weekly.plist",
-            "com.openclaw.memory.weekly",
-            scripts_dir / "weekly_drift_review.py",
-            workspace,
-            logs_dir,
-            hour=4,
-            minute=20,
-            weekday=0,
-        )
-        write_launchd_plist(
-            out / "com.openclaw.memory.session-hygiene.plist",
-            "com.openclaw.memory.session-hygiene",
-            scripts_dir / "session_hygiene.py",
-            workspace,
-            logs_dir,
-            hour=3,
-            minute=40,
-            extra_args=["--agent-id", args.agent_id, "--retention-days", "30", "--skip-recent-minutes", "30"],
-        )
+        out = fast_resolve(args.launchd_dir)
+        out.mkdir(parents=True, exist_ok=True)
+        for filename, payload in launchd_payloads(workspace, scripts_dir, args.agent_id):
+            write_launchd_plist(out / filename, payload)
         print(f"# launchd plists generated in {out}")
 
     return 0
@@ -5,18 +5,21 @@ from __future__ import annotations
 
 import argparse
 import datetime as dt
+import re
 from collections import defaultdict
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Set, Tuple
 
 from memory_lib import (
     MemoryEntry,
     atomic_write_text,
+    bitset_jaccard,
     ensure_workspace_layout,
     file_lock,
     jaccard_similarity,
     parse_iso_date,
     parse_memory_file,
+    token_bitsets,
     write_memory_file,
 )
 
@@ -30,20 +33,38 @@ SUPERSEDE_HINTS = [
     "moved from",
     "switched to",
 ]
-
-
-def classify_relation(newer: MemoryEntry, older: MemoryEntry) -> str:
-    sim = jaccard_similarity(newer.token_set(), older.token_set())
-    body = newer.body.lower()
-    if sim >= 0.20 and any(hint in body for hint in SUPERSEDE_HINTS):
+SUPERSEDE_HINT_RE = re.compile("|".join(map(re.escape, SUPERSEDE_HINTS)))
+# Lowest similarity at which any non-UNRELATED relation is possible.
+SUPERSEDE_MIN_SIMILARITY = 0.20
+# Without a supersede hint, REFINES is the weakest relation left.
+REFINE_MIN_SIMILARITY = 0.55
+
+
+def classify_relation(newer: MemoryEntry, older: MemoryEntry, sim: float | None = None) -> str:
+    if sim is None:
+        sim = jaccard_similarity(newer.token_set(), older.token_set())
+    body = newer.body_lower()
+    if sim >= SUPERSEDE_MIN_SIMILARITY and SUPERSEDE_HINT_RE.search(body):
         return "SUPERSEDES"
     if sim >= 0.85:
         return "REINFORCES"
-    if sim >= 0.55:
+    if sim >= REFINE_MIN_SIMILARITY:
         return "REFINES"
     return "UNRELATED"
 
 
+def index_by_tag(entries: List[Tuple[Path, MemoryEntry]]) -> Tuple[Dict[str, List[int]], List[int]]:
+    by_tag: Dict[str, List[int]] = defaultdict(list)
+    untagged: List[int] = []
+    for idx, (_, entry) in enumerate(entries):
+        tags = entry.tags()
+        if not tags:
+            untagged.append(idx)
+        for tag in set(tags):
+            by_tag[tag].append(idx)
+    return by_tag, untagged
+
+
 def load_semantic_entries(workspace: Path) -> List[Tuple[Path, str, List[MemoryEntry]]]:
     semantic_dir = workspace / "memory" / "semantic"
     semantic_dir.mkdir(parents=True, exist_ok=True)
@@ -112,28 +133,56 @@ def main() -> int:
         actions: List[str] = []
         changed = 0
         relation_counts = defaultdict(int)
-        for _, new_entry in recent:
+        older_by_tag, untagged_older = index_by_tag(older)
+        bits = token_bitsets(entry.token_set() for _, entry in recent + older)
+        recent_bits, older_bits = bits[: len(recent)], bits[len(recent) :]
+        recent_sizes = [len(entry.token_set()) for _, entry in recent]
+        older_sizes = [len(entry.token_set()) for _, entry in older]
+        dirty: Set[Path] = set()
+        retired: Set[int] = set()
+        for pos, (new_path, new_entry) in enumerate(recent):
             new_tags = set(new_entry.tags())
-            for _, old_entry in older:
-                if old_entry.meta.get("status", "active") == "historical":
+            if new_tags:
+                # Both-tagged pairs with disjoint tags are never compared; keep original order for stable output.
+                candidates = sorted(
+                    {idx for tag in new_tags for idx in older_by_tag.get(tag, ())}.union(untagged_older)
+                )
+            else:
+                candidates = range(len(older))
+            new_size = recent_sizes[pos]
+            has_hint = SUPERSEDE_HINT_RE.search(new_entry.body_lower()) is not None
+            floor = SUPERSEDE_MIN_SIMILARITY if has_hint else REFINE_MIN_SIMILARITY
+            for idx in candidates:
+                # Older entries only turn historical by being superseded in this loop.
+                if idx in retired:
                     continue
-                old_tags = set(old_entry.tags())
-                if new_tags and old_tags and not (new_tags & old_tags):
+                old_size = older_sizes[idx]
+                small, large = (new_size, old_size) if new_size <= old_size else (old_size, new_size)
+                # Jaccard never exceeds small/large, so lopsided pairs cannot reach this entry's weakest relation.
+                if not small or small / large < floor:
+                    relation_counts["UNRELATED"] += 1
                     continue
-                relation = classify_relation(new_entry, old_entry)
+                old_path, old_entry = older[idx]
+                relation = classify_relation(
+                    new_entry, old_entry, bitset_jaccard(recent_bits[pos], older_bits[idx])
+                )
                 relation_counts[relation] += 1
                 if relation == "SUPERSEDES":
+                    retired.add(idx)
                     old_entry.meta["status"] = "historical"
                     new_entry.meta["supersedes"] = f"mem:{old_entry.entry_id}"
+                    dirty.update((new_path, old_path))
                     changed += 1
                     actions.append(
                         f"- {now.date().isoformat()} SUPERSEDES new=mem:{new_entry.entry_id} "
                         f"old=mem:{old_entry.entry_id}"
                     )
 
-        if changed and not args.dry_run:
+        if dirty and not args.dry_run:
+            # Only files holding a re-statused or re-linked entry are rewritten.
             for path, (preamble, entries) in by_file.items():
-                write_memory_file(path, preamble, entries)
+                if path in dirty:
+                    write_memory_file(path, preamble, entries)
         append_drift_log(workspace, actions, dry_run=args.dry_run)
 
         print(
@@ -5,12 +5,17 @@ from __future__ import annotations
 
 import argparse
 import datetime as dt
+import json
+import os
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Any, Dict, List, Tuple
 
 from memory_lib import (
     MemoryEntry,
+    atomic_write_text,
     ensure_workspace_layout,
     file_lock,
     new_mem_id,
@@ -21,8 +26,24 @@ from memory_lib import (
     write_memory_file,
 )
 
-PREFERENCE_TAGS = {"preference", "style", "workflow", "tooling"}
-DECISION_TAGS = {"decision", "architecture", "policy", "constraint"}
+PREFERENCE_TAGS = frozenset({"preference", "style", "workflow", "tooling"})
+DECISION_TAGS = frozenset({"decision", "architecture", "policy", "constraint"})
+# Bump when the cached row layout or the grouping key changes.
+SEMANTIC_INDEX_FORMAT = "normalize_text/2"
+_EPOCH = dt.datetime(1970, 1, 1, tzinfo=dt.timezone.utc)
+
+
+@dataclass
+class SemanticRow:
+    path: str
+    position: int
+    entry_id: str
+    time: str
+    time_us: int
+    importance: float
+    confidence: float
+    tags: List[str]
+    origin_id: str
 
 
 def _identity_targets(workspace: Path) -> Dict[str, Path]:
@@ -35,40 +56,138 @@ def _identity_targets(workspace: Path) -> Dict[str, Path]:
 
 
 def _route_identity_file(tags: List[str]) -> str:
-    lowered = {t.lower() for t in tags}
-    if lowered & PREFERENCE_TAGS:
+    lowered = [t.lower() for t in tags]
+    if any(t in PREFERENCE_TAGS for t in lowered):
         return "preferences"
-    if lowered & DECISION_TAGS:
+    if any(t in DECISION_TAGS for t in lowered):
         return "decisions"
     return "identity"
 
 
-def _load_semantic_entries(workspace: Path, cutoff: dt.datetime) -> Dict[str, List[MemoryEntry]]:
+def _worker_count() -> int:
+    return min(8, os.cpu_count() or 4)
+
+
+def _semantic_index_path(workspace: Path) -> Path:
+    return workspace / "memory" / "state" / "identity-promote-index.json"
+
+
+def _epoch_us(value: dt.datetime) -> int:
+    return (value - _EPOCH) // dt.timedelta(microseconds=1)
+
+
+def _load_semantic_index(path: Path) -> Dict[str, Any]:
+    try:
+        payload = json.loads(path.read_bytes())
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(payload, dict) or payload.get("format") != SEMANTIC_INDEX_FORMAT:
+        return {}
+    files = payload.get("files")
+    return files if isinstance(files, dict) else {}
+
+
+def _write_semantic_index(path: Path, files: Dict[str, Any]) -> None:
+    payload = {"format": SEMANTIC_INDEX_FORMAT, "files": files}
+    try:
+        atomic_write_text(path, json.dumps(payload, separators=(",", ":")), mode=0o600)
+    except OSError:
+        pass
+
+
+def _semantic_rows(path: str) -> List[List[Any]]:
+    # [entry_id, grouping key, time, time as epoch microseconds or None, importance, confidence, tags, origin_id]
+    _, entries = parse_memory_file(Path(path))
+    rows: List[List[Any]] = []
+    for entry in entries:
+        parsed = _entry_time(entry)
+        rows.append(
+            [
+                entry.entry_id,
+                normalize_text(entry.body),
+                entry.meta.get("time", ""),
+                None if parsed is None else _epoch_us(parsed),
+                entry.get_float("importance", 0.0),
+                entry.get_float("confidence", 0.75),
+                entry.tags(),
+                entry.meta.get("origin_id", "").strip(),
+            ]
+        )
+    return rows
+
+
+def _valid_rows(rows: Any) -> bool:
+    # A hand-edited or truncated index falls back to re-parsing the file instead of failing the run.
+    return isinstance(rows, list) and all(
+        isinstance(row, list)
+        and len(row) == 8
+        and isinstance(row[0], str)
+        and isinstance(row[1], str)
+        and isinstance(row[2], str)
+        and (row[3] is None or isinstance(row[3], int))
+        and isinstance(row[4], (int, float))
+        and isinstance(row[5], (int, float))
+        and isinstance(row[6], list)
+        and all(isinstance(tag, str) for tag in row[6])
+        and isinstance(row[7], str)
+        for row in rows
+    )
+
+
+def _load_semantic_entries(
+    workspace: Path, cutoff: dt.datetime, index: Dict[str, Any]
+) -> Tuple[Dict[str, List[SemanticRow]], bool]:
+    # Unchanged files (same mtime_ns and size) are served from the index without re-parsing.
     semantic_dir = workspace / "memory" / "semantic"
     semantic_dir.mkdir(parents=True, exist_ok=True)
-    grouped: Dict[str, List[MemoryEntry]] = defaultdict(list)
-    for path in sorted(semantic_dir.glob("*.md")):
-        _, entries = parse_memory_file(path)
-        for entry in entries:
-            parsed = parse_iso_date(entry.meta.get("time", ""))
-            if parsed is None:
-                continue
-            if parsed.tzinfo is None:
-                parsed = parsed.replace(tzinfo=dt.timezone.utc)
-            if parsed < cutoff:
-                continue
-            key = normalize_text(entry.body)
-            if not key:
+    grouped: Dict[str, List[SemanticRow]] = defaultdict(list)
+    cutoff_us = _epoch_us(cutoff)
+    with os.scandir(semantic_dir) as it:
+        items = [item for item in it if item.name.endswith(".md") and item.is_file()]
+    items.sort(key=lambda item: item.name)
+    paths = [item.path for item in items]
+    stale: List[str] = []
+    for item in items:
+        st = item.stat()
+        cached = index.get(item.path)
+        if not (
+            isinstance(cached, dict)
+            and cached.get("mtime_ns") == st.st_mtime_ns
+            and cached.get("size") == st.st_size
+            and _valid_rows(cached.get("rows"))
+        ):
+            stale.append(item.path)
+            index[item.path] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size}
+    if len(stale) > 1:
+        # Files parse independently; rows are merged below in sorted path order.
+        with ThreadPoolExecutor(max_workers=_worker_count()) as pool:
+            for name, rows in zip(stale, pool.map(_semantic_rows, stale)):
+                index[name]["rows"] = rows
+    else:
+        for name in stale:
+            index[name]["rows"] = _semantic_rows(name)
+    changed = bool(stale)
+    for name in paths:
+        for position, (entry_id, key, time, ts, importance, confidence, tags, origin_id) in enumerate(
+            index[name]["rows"]
+        ):
+            if ts is None or ts < cutoff_us or not key:
                 continue
-            grouped[key].append(entry)
-    return grouped
+            grouped[key].append(
+                SemanticRow(name, position, entry_id, time, ts, importance, confidence, tags, origin_id)
+            )
+    for name in set(index) - set(paths):
+        del index[name]
+        changed = True
+    return grouped, changed
 
 
-def _load_existing_identity_signatures(workspace: Path) -> Tuple[set[str], set[str]]:
+def _existing_identity_signatures(
+    loaded_targets: Dict[str, Tuple[str, List[MemoryEntry]]]
+) -> Tuple[set[str], set[str]]:
     keys: set[str] = set()
     origin_ids: set[str] = set()
-    for path in _identity_targets(workspace).values():
-        _, entries = parse_memory_file(path)
+    for _, entries in loaded_targets.values():
         for entry in entries:
             body_key = normalize_text(entry.body)
             if body_key:
@@ -79,15 +198,18 @@ def _load_existing_identity_signatures(workspace: Path) -> Tuple[set[str], set[s
     return keys, origin_ids
 
 
-def _select_best_entry(entries: List[MemoryEntry]) -> MemoryEntry:
-    def sort_key(entry: MemoryEntry) -> Tuple[float, dt.datetime]:
-        importance = entry.get_float("importance", 0.0)
-        ts = parse_iso_date(entry.meta.get("time", "")) or dt.datetime.now(dt.timezone.utc)
-        if ts.tzinfo is None:
-            ts = ts.replace(tzinfo=dt.timezone.utc)
-        return (importance, ts)
+def _select_best_row(rows: List[SemanticRow]) -> SemanticRow:
+    return max(rows, key=lambda row: (row.importance, row.time_us))
+
 
-    return max(entries, key=sort_key)
+def _load_row_entry(row: SemanticRow, parsed_files: Dict[str, List[MemoryEntry]]) -> MemoryEntry | None:
+    # The index holds no meta or body; re-read the source file only for groups that reach promotion.
+    if row.path not in parsed_files:
+        parsed_files[row.path] = parse_memory_file(Path(row.path))[1]
+    entries = parsed_files[row.path]
+    if row.position < len(entries) and entries[row.position].entry_id == row.entry_id:
+        return entries[row.position]
+    return None
 
 
 def _entry_time(entry: MemoryEntry) -> dt.datetime | None:
@@ -99,6 +221,13 @@ def _entry_time(entry: MemoryEntry) -> dt.datetime | None:
     return parsed
 
 
+def _entry_day(row: SemanticRow) -> dt.date:
+    parsed = parse_iso_date(row.time)
+    if parsed is None:
+        return (_EPOCH + dt.timedelta(microseconds=row.time_us)).date()
+    return parsed.date()
+
+
 def _infer_durability(tags: List[str], body: str, existing: str) -> str:
     if existing in {"transient", "project-stable", "foundational"}:
         return existing
@@ -160,13 +289,15 @@ def main() -> int:
 
         cutoff = dt.datetime.now(dt.timezone.utc) - dt.timedelta(days=args.window_days)
 
-        grouped = _load_semantic_entries(workspace, cutoff=cutoff)
-        existing_keys, existing_origin_ids = _load_existing_identity_signatures(workspace)
+        index_path = _semantic_index_path(workspace)
+        semantic_index = _load_semantic_index(index_path)
+        grouped, index_changed = _load_semantic_entries(workspace, cutoff=cutoff, index=semantic_index)
 
         target_files = _identity_targets(workspace)
         loaded_targets: Dict[str, Tuple[str, List[MemoryEntry]]] = {}
         for name, path in target_files.items():
             loaded_targets[name] = parse_memory_file(path)
+        existing_keys, existing_origin_ids = _existing_identity_signatures(loaded_targets)
 
         promoted_counts = {"identity": 0, "preferences": 0, "decisions": 0}
         skipped_duplicate = 0
@@ -180,52 +311,61 @@ def main() -> int:
         group_items.sort(
             key=lambda kv: (
                 -len(kv[1]),
-                -max(e.get_float("importance", 0.0) for e in kv[1]),
+                -max(row.importance for row in kv[1]),
             )
         )
         if args.max_groups >= 0:
             group_items = group_items[: args.max_groups]
 
         now = dt.datetime.now(dt.timezone.utc)
+        parsed_files: Dict[str, List[MemoryEntry]] = {}
 
-        for key, entries in group_items:
-            recurrence = len(entries)
-            best = _select_best_entry(entries)
-            if recurrence < args.min_recurrence or best.get_float("importance", 0.0) < args.min_importance:
+        for key, rows in group_items:
+            # Already-promoted concepts are the common case on steady-state runs; skip them before any ranking.
+            if key in existing_keys:
+                skipped_duplicate += 1
+                continue
+            recurrence = len(rows)
+            # Most groups are singletons; reject them on size before ranking their entries.
+            if recurrence < args.min_recurrence:
+                skipped_threshold += 1
+                continue
+            best_row = _select_best_row(rows)
+            if best_row.importance < args.min_importance:
                 skipped_threshold += 1
                 continue
 
-            distinct_days = {
-                ts.date()
-                for ts in (_entry_time(entry) for entry in entries)
-                if ts is not None
-            }
+            # Days are taken in each entry's own UTC offset, as written.
+            distinct_days = {_entry_day(row) for row in rows}
             if len(distinct_days) < args.min_distinct_days:
                 skipped_recurrence_shape += 1
                 continue
 
-            timestamps = [ts for ts in (_entry_time(entry) for entry in entries) if ts is not None]
-            if timestamps:
-                earliest = min(timestamps)
-                if (now - earliest) < dt.timedelta(days=max(args.min_age_days, 0)):
-                    skipped_young += 1
-                    continue
+            earliest = _EPOCH + dt.timedelta(microseconds=min(row.time_us for row in rows))
+            if (now - earliest) < dt.timedelta(days=max(args.min_age_days, 0)):
+                skipped_young += 1
+                continue
+
+            best = _load_row_entry(best_row, parsed_files)
+            if best is None:
+                # The file changed after it was indexed; the next run re-parses it.
+                continue
 
             if _is_expired(best, now):
                 skipped_expired += 1
                 continue
 
-            durability = _infer_durability(best.tags(), best.body, best.meta.get("durability", "").strip().lower())
+            durability = _infer_durability(best_row.tags, best.body, best.meta.get("durability", "").strip().lower())
             if durability == "transient":
                 skipped_durability += 1
                 continue
 
-            best_origin_id = best.meta.get("origin_id", "").strip() or best.entry_id
-            if key in existing_keys or best_origin_id in existing_origin_ids:
+            best_origin_id = best_row.origin_id or best_row.entry_id
+            if best_origin_id in existing_origin_ids:
                 skipped_duplicate += 1
                 continue
 
-            target_name = _route_identity_file(best.tags())
+            target_name = _route_identity_file(best_row.tags)
             _, target_entries = loaded_targets[target_name]
             target_entries.append(
                 MemoryEntry(
@@ -234,10 +374,10 @@ def main() -> int:
                         "time": utc_now_z(),
                         "layer": "identity",
                         "importance": f"{best.get_float('importance', args.min_importance):.2f}",
-                        "confidence": f"{best.get_float('confidence', 0.75):.2f}",
+                        "confidence": f"{best_row.confidence:.2f}",
                         "status": "active",
                         "source": "job:weekly-identity-promote",
-                        "tags": str(best.tags()),
+                        "tags": str(best_row.tags),
                         "supersedes": "none",
                         "origin_id": best_origin_id,
                         "recurrence": str(recurrence),
@@ -254,7 +394,11 @@ def main() -> int:
 
         if not args.dry_run:
             for target_name, (preamble, entries) in loaded_targets.items():
-                write_memory_file(target_files[target_name], preamble, entries)
+                if promoted_counts[target_name]:
+                    # Identity files change rarely and are not rebuilt by later runs; make them durable.
+                    write_memory_file(target_files[target_name], preamble, entries, fsync=True)
+            if index_changed:
+                _write_semantic_index(index_path, semantic_index)
 
         print(
             "weekly_identity_promote "